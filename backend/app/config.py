@@ -15,6 +15,32 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./timesheet.db"
+    # Connection pool (PostgreSQL) and the worker threads that run sync endpoints.
+    # Sync routes hold a thread and a connection for their whole duration, so
+    # raise these together to serve more concurrent dashboard/report requests.
+    # All three are per process: with the Dockerfile's 4 uvicorn workers the
+    # database sees up to 4 x (db_pool_size + db_max_overflow) = 80 connections,
+    # under PostgreSQL's default max_connections of 100 with room left for
+    # migrations and admin sessions. Recheck that product when changing the
+    # worker count or the database's limit.
+    # Keep threadpool_size <= db_pool_size + db_max_overflow so a worker's
+    # requests never queue on its pool; one that still can't get a connection
+    # fails after db_pool_timeout seconds instead of hanging.
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 10
+    threadpool_size: int = 20
+    # Seconds a per-user dashboard response is served from memory (0 disables)
+    dashboard_cache_ttl: int = 30
+    # Seconds a user's email preferences are served from memory (0 disables).
+    # Writes through the email settings endpoints refresh the entry immediately;
+    # other workers pick the change up once their copy expires.
+    email_preferences_cache_ttl: int = 60
+    # Seconds an expense analytics response is reused for the same scope and
+    # period (0 disables). A write clears it only in the worker that made it;
+    # the other workers keep serving their copy until it expires, so keep this
+    # as short as the dashboard cache.
+    expense_analytics_cache_ttl: int = 30
     
     # JWT — no hardcoded default; MUST be set via .env
     secret_key: str = ""
@@ -4,20 +4,28 @@ from app.config import get_settings
 
 settings = get_settings()
 
+# Compiled-SQL cache entries per engine. SQLAlchemy's default of 500 is less
+# than the distinct statements the routers issue (every optional filter makes
+# a new shape), so hot dashboard queries would get evicted and recompiled.
+QUERY_CACHE_SIZE = 1200
+
 # Handle SQLite vs PostgreSQL connection
 if settings.database_url.startswith("sqlite"):
     engine = create_engine(
         settings.database_url,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        query_cache_size=QUERY_CACHE_SIZE
     )
 else:
     # PostgreSQL / Neon serverless — use pool settings to handle connection pooler
     engine = create_engine(
         settings.database_url,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
         pool_pre_ping=True,      # Verify connections before use (handles Neon sleep)
         pool_recycle=300,        # Recycle connections every 5 min (avoids stale pooler conns)
+        query_cache_size=QUERY_CACHE_SIZE,
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -84,6 +84,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "Accept", "Origin", "X-Requested-With"],
+    # Keyset pagination cursor for list endpoints (app/utils/pagination.py)
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -104,8 +106,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["X-XSS-Protection"] = "1; mode=block"
         # HSTS for HTTPS
         response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        # Prevent caching of sensitive API responses
-        if request.url.path.startswith("/api/"):
+        # Prevent caching of sensitive API responses (unless the route opted in)
+        if request.url.path.startswith("/api/") and "cache-control" not in response.headers:
             response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
             response.headers["Pragma"] = "no-cache"
         return response
@@ -225,7 +227,10 @@ app.include_router(system_stats.router)
 
 @app.on_event("startup")
 async def startup_event():
+    import anyio.to_thread
     from app.services.scheduler_service import scheduler_service
+    # Sync endpoints run on this pool; size it from settings rather than anyio's default
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
     from app.database import SessionLocal
     scheduler_service.set_db_session_factory(SessionLocal)
     scheduler_service.start()
@@ -1,7 +1,7 @@
 """Automation models for if-this-then-that rules engine."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Integer, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Integer, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -96,6 +96,10 @@ class TaskTemplate(Base):
     
     # Relationships
     created_by = relationship("User", back_populates="task_templates", foreign_keys=[created_by_id])
+    
+    __table_args__ = (
+        Index('idx_task_templates_creator_global', 'created_by_id', 'is_global'),
+    )
 
 
 class ProjectTemplate(Base):
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -24,4 +24,9 @@ class Client(Base):
     # Relationships
     organization = relationship("Organization", back_populates="clients")
     projects = relationship("Project", back_populates="client")
+    
+    __table_args__ = (
+        # Keyset pagination of the list endpoint (ORDER BY name, id)
+        Index('idx_clients_name_id', 'name', 'id'),
+    )
 
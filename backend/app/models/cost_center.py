@@ -1,6 +1,6 @@
 """Cost Center model for expense tracking and budget management."""
 import uuid
-from sqlalchemy import Column, String, Boolean, Numeric, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Boolean, Numeric, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -24,3 +24,11 @@ class CostCenter(Base):
     # Relationships
     department = relationship("Department", backref="cost_centers")
     expenses = relationship("Expense", back_populates="cost_center")
+    
+    # Fetch server-generated created_at/updated_at with RETURNING on flush
+    __mapper_args__ = {"eager_defaults": True}
+    
+    __table_args__ = (
+        # Keyset pagination of the list endpoint (ORDER BY name, id)
+        Index('idx_cost_centers_name_id', 'name', 'id'),
+    )
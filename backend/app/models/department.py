@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Date, Boolean, func, Numeric
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Date, Boolean, Index, func, Numeric
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -41,6 +41,11 @@ class Department(Base):
     projects = relationship("Project", back_populates="department")
     tasks = relationship("Task", back_populates="department")
     
+    __table_args__ = (
+        # Keyset pagination of the list endpoint (ORDER BY name, id)
+        Index('idx_departments_name_id', 'name', 'id'),
+    )
+    
     @property
     def managers(self):
         """Get list of manager users."""
@@ -1,7 +1,7 @@
 """Email settings and log models for email notifications."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Integer, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Integer, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -74,6 +74,11 @@ class EmailLog(Base):
     # Relationships
     user = relationship("User", backref="email_logs")
 
+    __table_args__ = (
+        # Newest-first log pages per user, seeked on (created_at, id)
+        Index('idx_email_logs_user_created', 'user_id', 'created_at', 'id'),
+    )
+
 
 class TaskReminder(Base):
     """Scheduled task reminders."""
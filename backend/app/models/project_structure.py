@@ -1,7 +1,7 @@
 """Project structure models - Phases, Epics, and Milestones."""
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Date, ForeignKey, Integer, Float, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Date, ForeignKey, Integer, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -70,3 +70,7 @@ class Milestone(Base):
     
     # Relationships
     project = relationship("Project", back_populates="milestones")
+    
+    __table_args__ = (
+        Index('idx_milestones_due', 'due_date'),
+    )
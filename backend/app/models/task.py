@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Text, Float, ForeignKey, DateTime, Integer, Boolean, JSON
+from sqlalchemy import Column, String, Text, Float, ForeignKey, DateTime, Integer, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -107,3 +107,16 @@ class Task(Base):
     comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan")
     attachments = relationship("TaskAttachment", back_populates="task", cascade="all, delete-orphan")
     audit_logs = relationship("TaskAuditLog", back_populates="task", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Per-user open task lookups (assignee) and unassigned personal tasks;
+        # due_date lets dashboard "due today"/deadline counts stay in the index
+        Index('idx_tasks_assignee_status_due', 'assignee_id', 'status', 'due_date'),
+        # Dashboard completed-today/this-week counts and completion trends
+        Index('idx_tasks_assignee_completed', 'assignee_id', 'completed_at'),
+        Index('idx_tasks_type_assignee', 'task_type', 'assignee_id'),
+        # Calendar date-range lookups; one index per OR'd range so each arm is indexable
+        Index('idx_tasks_due_start', 'due_date', 'start_date'),
+        Index('idx_tasks_start_due', 'start_date', 'due_date'),
+        Index('idx_tasks_project_due', 'project_id', 'due_date'),
+    )
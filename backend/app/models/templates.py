@@ -1,5 +1,5 @@
 """Additional models for advanced features (filters, reactions, invites, reports, MFA)."""
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -23,7 +23,7 @@ class SavedFilter(Base):
     view_type = Column(String(50), default="list")  # list, kanban, calendar, etc.
     
     # Sharing
-    is_shared = Column(String(10), default="false")
+    is_shared = Column(Boolean, default=False, nullable=False)
     share_token = Column(String(100), nullable=True)
     
     # Ownership
@@ -35,6 +35,15 @@ class SavedFilter(Base):
     
     # Relationships
     user = relationship("User", back_populates="saved_filters")
+    
+    __table_args__ = (
+        Index('idx_saved_filters_user_entity', 'user_id', 'entity_type'),
+        Index(
+            'idx_saved_filters_share_token', 'share_token', unique=True,
+            postgresql_where=text("share_token IS NOT NULL"),
+            sqlite_where=text("share_token IS NOT NULL"),
+        ),
+    )
 
 
 class CommentReaction(Base):
@@ -78,6 +87,10 @@ class UserInvite(Base):
     
     # Relationships
     invited_by = relationship("User", back_populates="sent_invites")
+    
+    __table_args__ = (
+        Index('idx_user_invites_email_status', 'email', 'status'),
+    )
 
 
 class ScheduledReport(Base):
@@ -114,6 +127,10 @@ class ScheduledReport(Base):
     
     # Relationships
     created_by = relationship("User", back_populates="scheduled_reports")
+    
+    __table_args__ = (
+        Index('idx_scheduled_reports_created_by', 'created_by_id'),
+    )
 
 
 class MFASettings(Base):
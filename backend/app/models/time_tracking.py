@@ -4,7 +4,7 @@ Active timer and time log models for time tracking functionality.
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Text, ForeignKey, DateTime, Boolean, func
+from sqlalchemy import Column, String, Float, Text, ForeignKey, DateTime, Boolean, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -48,6 +48,11 @@ class TimeLog(Base):
     user = relationship("User", back_populates="time_logs")
     task = relationship("Task", foreign_keys=[task_id])
     project = relationship("Project", foreign_keys=[project_id])
+    
+    __table_args__ = (
+        # Per-user hours for a day or week (dashboards, time-logged chart)
+        Index('idx_time_logs_user_date', 'user_id', 'date'),
+    )
 
 
 class Capacity(Base):
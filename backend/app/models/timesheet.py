@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Date, Float, Text, ForeignKey, DateTime, func
+from sqlalchemy import Column, String, Date, Float, Text, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -28,6 +28,11 @@ class Timesheet(Base):
     submitted_at = Column(DateTime, nullable=True)
     approved_at = Column(DateTime, nullable=True)
     
+    __table_args__ = (
+        # Per-user timesheet lists and pending-approval counts
+        Index('idx_timesheets_user_status', 'user_id', 'status'),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="timesheets")
     entries = relationship("TimeEntry", back_populates="timesheet", cascade="all, delete-orphan")
@@ -45,6 +50,11 @@ class TimeEntry(Base):
     hours = Column(Float, default=0.0)
     notes = Column(Text, nullable=True)
     
+    __table_args__ = (
+        # Entries of a timesheet, optionally narrowed to a day range
+        Index('idx_time_entries_timesheet_day', 'timesheet_id', 'day'),
+    )
+    
     # Relationships
     timesheet = relationship("Timesheet", back_populates="entries")
     project = relationship("Project", back_populates="time_entries")
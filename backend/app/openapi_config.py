@@ -2,9 +2,17 @@
 Enhanced OpenAPI documentation configuration.
 Custom documentation with examples, authentication details, and webhook information.
 """
-from fastapi import FastAPI
+import hashlib
+import json
+from fastapi import FastAPI, Request, Response
 from fastapi.openapi.utils import get_openapi
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Set, Tuple
+
+# Top-level keys kept in the runtime ("lite") schema; docs-only content is dropped.
+LITE_SCHEMA_KEYS = ("openapi", "info", "paths", "components", "security")
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+# The schema only changes across deploys; clients revalidate with If-None-Match.
+OPENAPI_CACHE_CONTROL = "public, max-age=60"
 
 
 def custom_openapi(app: FastAPI) -> Dict[str, Any]:
@@ -388,8 +396,118 @@ For API support, contact: api-support@lightidea.com
     return app.openapi_schema
 
 
+def _collect_schema_refs(node: Any, refs: Set[str]) -> None:
+    """
+    Recursively collect component schema names referenced via `$ref`.
+    """
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+            refs.add(ref[len(SCHEMA_REF_PREFIX):])
+        for value in node.values():
+            _collect_schema_refs(value, refs)
+    elif isinstance(node, list):
+        for item in node:
+            _collect_schema_refs(item, refs)
+
+
+def _strip_examples(node: Any, is_properties: bool = False) -> Any:
+    """
+    Return a copy of the node without `example` / `examples` entries.
+    Keys directly under `properties` are field names and are always kept.
+    """
+    if isinstance(node, dict):
+        return {
+            key: _strip_examples(value, key == "properties" and not is_properties)
+            for key, value in node.items()
+            if is_properties or key not in ("example", "examples")
+        }
+    if isinstance(node, list):
+        return [_strip_examples(item) for item in node]
+    return node
+
+
+def build_lite_openapi(openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derive a trimmed runtime schema for codegen and client tooling.
+
+    Keeps paths, security and the component schemas reachable from paths;
+    drops examples, webhooks, servers, external docs and the long Markdown
+    description.
+    """
+    lite = _strip_examples({
+        key: value for key, value in openapi_schema.items() if key in LITE_SCHEMA_KEYS
+    })
+
+    info = dict(lite.get("info", {}))
+    description = (info.get("description") or "").strip()
+    if description:
+        info["description"] = description.splitlines()[0].lstrip("# ").strip()
+    lite["info"] = info
+
+    components = lite.get("components", {})
+    schemas = components.get("schemas", {})
+    if schemas:
+        # Reachability walk from paths so unused component schemas are pruned
+        reachable: Set[str] = set()
+        pending: Set[str] = set()
+        _collect_schema_refs(lite.get("paths", {}), pending)
+        while pending:
+            name = pending.pop()
+            if name in reachable or name not in schemas:
+                continue
+            reachable.add(name)
+            _collect_schema_refs(schemas[name], pending)
+        components["schemas"] = {
+            name: schema for name, schema in schemas.items() if name in reachable
+        }
+
+    return lite
+
+
+def _cached_document(app: FastAPI, name: str, build: Callable[[], Dict[str, Any]]) -> Tuple[bytes, str]:
+    """
+    Serialize a schema document once and cache its bytes and ETag on app.state.
+    Built lazily on first request, when all routers are registered.
+    """
+    cache = getattr(app.state, "openapi_documents", None)
+    if cache is None:
+        cache = app.state.openapi_documents = {}
+    if name not in cache:
+        body = json.dumps(build(), separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        cache[name] = (body, etag)
+    return cache[name]
+
+
+def _document_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Return the document, or an empty 304 when the client already has it.
+    """
+    headers = {"ETag": etag, "Cache-Control": OPENAPI_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 def setup_custom_openapi(app: FastAPI):
     """
     Setup custom OpenAPI schema for the application.
     """
     app.openapi = lambda: custom_openapi(app)
+
+    # Replace FastAPI's default schema route with a conditional-GET aware one
+    app.router.routes = [
+        route for route in app.router.routes
+        if getattr(route, "path", None) != app.openapi_url
+    ]
+
+    @app.get(app.openapi_url, include_in_schema=False)
+    def openapi_json(request: Request) -> Response:
+        body, etag = _cached_document(app, "full", app.openapi)
+        return _document_response(request, body, etag)
+
+    @app.get("/api/openapi-lite.json", include_in_schema=False)
+    def openapi_lite(request: Request) -> Response:
+        body, etag = _cached_document(app, "lite", lambda: build_lite_openapi(app.openapi()))
+        return _document_response(request, body, etag)
@@ -1,23 +1,38 @@
 """Advanced features router - Templates, Saved Filters, Invites, MFA, Bulk Upload."""
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple, Type, Union
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from pydantic import BaseModel, EmailStr
+from sqlalchemy import DateTime, Float, String, cast, or_, insert, select, literal
+from sqlalchemy.exc import SQLAlchemyError
+from pydantic import AliasChoices, BaseModel, EmailStr, Field, field_validator
 import csv
 import io
+import json
+import base64
+import os
 import uuid
 import secrets
 
 from app.database import get_db
-from app.models import User, Task, Project, TaskTemplate, ProjectTemplate
+from app.models import User, Task, Project, Timesheet, TaskTemplate, ProjectTemplate
 from app.models.templates import SavedFilter, UserInvite, ScheduledReport, MFASettings
-from app.utils import get_current_active_user, get_password_hash
-from app.services.email_service import email_service, EmailTemplates
+from app.utils import get_current_active_user, get_password_hashes
+from app.services.email_service import send_invite_email
 
 router = APIRouter()
 
+# Rows parsed, checked and inserted per round-trip in the CSV bulk endpoints
+BULK_BATCH_SIZE = 1000
+
+
+def _batch_tokens(count: int, nbytes: int = 32) -> Iterator[str]:
+    """Yield `count` URL-safe tokens like secrets.token_urlsafe(nbytes) from one urandom read."""
+    raw = os.urandom(count * nbytes)
+    for offset in range(0, len(raw), nbytes):
+        yield base64.urlsafe_b64encode(raw[offset:offset + nbytes]).rstrip(b"=").decode("ascii")
+
 
 def _parse_due_date(value: str) -> datetime:
     """Parse an ISO date string, raising HTTPException on invalid input."""
@@ -27,6 +42,49 @@ def _parse_due_date(value: str) -> datetime:
         raise HTTPException(status_code=422, detail=f"Invalid date format: {value}")
 
 
+def _iter_csv_batches(
+    upload: UploadFile,
+    row_model: Type[BaseModel],
+    batch_size: int = BULK_BATCH_SIZE
+) -> Iterator[List[BaseModel]]:
+    """Stream rows of an uploaded CSV as validated row models, in fixed-size batches."""
+    # utf-8-sig strips the BOM Excel adds, which would otherwise corrupt the first header
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        
+        # Resolve every model field to a column index once, honouring alias
+        # choices such as name -> full_name, so rows are read by position
+        col_idx = {name: i for i, name in enumerate(header)}
+        columns = []
+        for field_name, field in row_model.model_fields.items():
+            alias = field.validation_alias
+            names = alias.choices if isinstance(alias, AliasChoices) else [field_name]
+            for name in names:
+                if name in col_idx:
+                    columns.append((name, col_idx[name]))
+                    break
+        
+        validate = row_model.model_validate
+        batch = []
+        for row in reader:
+            if not row:
+                continue
+            width = len(row)
+            batch.append(validate({name: row[i] for name, i in columns if i < width}))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        # Leave the underlying upload file open; UploadFile owns it
+        text.detach()
+
+
 # ==================== SCHEMAS ====================
 
 class UserInviteCreate(BaseModel):
@@ -35,6 +93,36 @@ class UserInviteCreate(BaseModel):
     team_id: Optional[str] = None
 
 
+class BulkInviteRow(BaseModel):
+    email: str = ""
+    role: str = "contributor"
+
+    @field_validator('email')
+    def strip_email(cls, v):
+        return v.strip()
+
+
+class BulkUserRow(BaseModel):
+    email: str = ""
+    full_name: str = Field("", validation_alias=AliasChoices("full_name", "name"))
+    password: Optional[str] = None
+    role: str = "employee"
+    position: Optional[str] = Field(None, validation_alias=AliasChoices("position", "job_title"))
+    phone: Optional[str] = None
+    skills: Optional[List[str]] = None
+    timezone: str = "Africa/Cairo"
+
+    @field_validator('email', 'full_name')
+    def strip_required(cls, v):
+        return v.strip()
+
+    @field_validator('skills', mode='before')
+    def split_skills(cls, v):
+        if isinstance(v, str):
+            return v.split(",") if v else None
+        return v
+
+
 class BulkUploadResult(BaseModel):
     total: int
     created: int
@@ -46,7 +134,7 @@ class TaskTemplateCreate(BaseModel):
     name: str
     description: Optional[str] = None
     default_priority: str = "medium"
-    estimated_hours: Optional[str] = None
+    estimated_hours: Optional[int] = None
     default_tags: List[str] = []
     checklist_items: List[str] = []
     is_global: bool = False
@@ -57,9 +145,10 @@ class TaskTemplateResponse(BaseModel):
     name: str
     description: Optional[str]
     default_priority: str
-    estimated_hours: Optional[str]
-    default_tags: List
-    checklist_items: List
+    estimated_hours: Optional[int]
+    default_tags: Optional[List] = None
+    # Stored in TaskTemplate.checklist
+    checklist_items: Optional[List] = Field(None, validation_alias="checklist")
 
     class Config:
         from_attributes = True
@@ -82,7 +171,7 @@ class SavedFilterResponse(BaseModel):
     entity_type: str
     filter_config: dict
     view_type: str
-    is_shared: str
+    is_shared: bool
     share_token: Optional[str]
 
     class Config:
@@ -110,17 +199,18 @@ async def invite_user(
     current_user: User = Depends(get_current_active_user)
 ):
     """Send an email invitation to a new user."""
-    # Check if user already exists
-    existing = db.query(User).filter(User.email == invite_data.email).first()
-    if existing:
+    # Check for an existing user or pending invite in one round-trip
+    conflicts = set(db.execute(
+        select(literal("user")).where(User.email == invite_data.email).union_all(
+            select(literal("invite")).where(
+                UserInvite.email == invite_data.email,
+                UserInvite.status == "pending"
+            )
+        )
+    ).scalars())
+    if "user" in conflicts:
         raise HTTPException(status_code=400, detail="User with this email already exists")
-    
-    # Check for pending invite
-    pending = db.query(UserInvite).filter(
-        UserInvite.email == invite_data.email,
-        UserInvite.status == "pending"
-    ).first()
-    if pending:
+    if "invite" in conflicts:
         raise HTTPException(status_code=400, detail="Invitation already pending for this email")
     
     # Create invite
@@ -136,29 +226,56 @@ async def invite_user(
     db.add(invite)
     db.commit()
     
-    # Send invitation email
-    invite_url = f"/register?token={token}"
-    html_content = f"""
-    <h2>You're Invited!</h2>
-    <p><strong>{current_user.full_name}</strong> has invited you to join TimeSheet.</p>
-    <p>Click the link below to create your account:</p>
-    <a href="{invite_url}" style="display: inline-block; background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px;">Accept Invitation</a>
-    <p>This invitation expires in 7 days.</p>
-    """
-    html = EmailTemplates.base_template(html_content, "You're Invited to TimeSheet")
-    
-    background_tasks.add_task(
-        email_service.send_email,
-        invite_data.email,
-        "You're Invited to TimeSheet",
-        html
-    )
+    # Render and send the invitation email after the response goes out
+    background_tasks.add_task(send_invite_email, invite_data.email, token, current_user.full_name)
     
     return {"message": "Invitation sent successfully", "invite_id": invite.id}
 
 
+def _validate_invite_row(row: BulkInviteRow, existing: set, pending: set, seen: set) -> Tuple[bool, Union[dict, str]]:
+    """Check one invite row, returning (True, insert values) or (False, error message)."""
+    if not row.email:
+        return False, "Email is required"
+    if row.email in existing:
+        return False, "User already exists"
+    if row.email in pending or row.email in seen:
+        return False, "Invitation already pending"
+    seen.add(row.email)
+    return True, {"email": row.email, "role": row.role}
+
+
+def _validate_user_row(row: BulkUserRow, existing: set, seen: set) -> Tuple[bool, Union[dict, str]]:
+    """Check one user row, returning (True, insert values) or (False, error message)."""
+    if not row.email or not row.full_name:
+        return False, "Email and full_name are required"
+    if row.email in existing or row.email in seen:
+        return False, "User already exists"
+    seen.add(row.email)
+    return True, row.model_dump()
+
+
+def _insert_bulk_batch(db: Session, model, values: List[dict], row_numbers: List[int], result: BulkUploadResult):
+    """Insert one batch of validated rows in a savepoint and record the outcome."""
+    if not values:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(model), values)
+    except SQLAlchemyError:
+        # e.g. an email registered concurrently; earlier batches are kept
+        result.failed += len(values)
+        result.errors.extend(
+            {"row": row_number, "email": row_values["email"], "error": "Failed to save row"}
+            for row_number, row_values in zip(row_numbers, values)
+        )
+        return
+    result.created += len(values)
+
+
+# The CSV endpoints are plain `def` so FastAPI runs the parse, hash and insert
+# work in its threadpool instead of blocking the event loop on sync SQLAlchemy
 @router.post("/invites/bulk", response_model=BulkUploadResult)
-async def bulk_invite_users(
+def bulk_invite_users(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -167,45 +284,45 @@ async def bulk_invite_users(
     if current_user.role not in ["admin", "system_admin", "org_admin"]:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    content = await file.read()
-    decoded = content.decode("utf-8")
-    reader = csv.DictReader(io.StringIO(decoded))
-    
     result = BulkUploadResult(total=0, created=0, failed=0, errors=[])
+    seen = set()
+    # Every invite in one upload shares the inviter and expiry
+    invited_by_id = current_user.id
+    expires_at = datetime.utcnow() + timedelta(days=7)
     
-    for row in reader:
-        result.total += 1
-        try:
-            email = row.get("email", "").strip()
-            if not email:
-                raise ValueError("Email is required")
-            
-            # Check if exists
-            if db.query(User).filter(User.email == email).first():
-                raise ValueError("User already exists")
-            
-            # Create invite
-            token = secrets.token_urlsafe(32)
-            invite = UserInvite(
-                email=email,
-                token=token,
-                role=row.get("role", "contributor"),
-                invited_by_id=current_user.id,
-                expires_at=datetime.utcnow() + timedelta(days=7)
+    for rows in _iter_csv_batches(file, BulkInviteRow):
+        # Look up existing users and pending invites for the whole batch at once
+        emails = [row.email for row in rows]
+        existing = set(db.execute(select(User.email).where(User.email.in_(emails))).scalars())
+        pending = set(db.execute(
+            select(UserInvite.email).where(
+                UserInvite.email.in_(emails),
+                UserInvite.status == "pending"
             )
-            db.add(invite)
-            result.created += 1
-            
-        except Exception as e:
-            result.failed += 1
-            result.errors.append({"row": result.total, "email": row.get("email"), "error": str(e)})
+        ).scalars())
+        invites = []
+        row_numbers = []
+        
+        for row in rows:
+            result.total += 1
+            ok, payload = _validate_invite_row(row, existing, pending, seen)
+            if ok:
+                invites.append(payload)
+                row_numbers.append(result.total)
+            else:
+                result.failed += 1
+                result.errors.append({"row": result.total, "email": row.email, "error": payload})
+        
+        for invite, token in zip(invites, _batch_tokens(len(invites))):
+            invite.update(token=token, invited_by_id=invited_by_id, expires_at=expires_at)
+        _insert_bulk_batch(db, UserInvite, invites, row_numbers, result)
     
     db.commit()
     return result
 
 
 @router.post("/users/bulk-upload", response_model=BulkUploadResult)
-async def bulk_create_users(
+def bulk_create_users(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -214,41 +331,31 @@ async def bulk_create_users(
     if current_user.role not in ["admin", "system_admin", "org_admin"]:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    content = await file.read()
-    decoded = content.decode("utf-8")
-    reader = csv.DictReader(io.StringIO(decoded))
-    
     result = BulkUploadResult(total=0, created=0, failed=0, errors=[])
+    seen = set()
     
-    for row in reader:
-        result.total += 1
-        try:
-            email = row.get("email", "").strip()
-            full_name = row.get("full_name", row.get("name", "")).strip()
-            password = row.get("password", secrets.token_urlsafe(12))
-            
-            if not email or not full_name:
-                raise ValueError("Email and full_name are required")
-            
-            if db.query(User).filter(User.email == email).first():
-                raise ValueError("User already exists")
-            
-            user = User(
-                email=email,
-                full_name=full_name,
-                password_hash=get_password_hash(password),
-                role=row.get("role", "employee"),
-                position=row.get("position", row.get("job_title")),
-                phone=row.get("phone"),
-                skills=row.get("skills", "").split(",") if row.get("skills") else None,
-                timezone=row.get("timezone", "Africa/Cairo")
-            )
-            db.add(user)
-            result.created += 1
-            
-        except Exception as e:
-            result.failed += 1
-            result.errors.append({"row": result.total, "email": row.get("email"), "error": str(e)})
+    for rows in _iter_csv_batches(file, BulkUserRow):
+        # Look up existing users for the whole batch at once
+        emails = [row.email for row in rows]
+        existing = set(db.execute(select(User.email).where(User.email.in_(emails))).scalars())
+        users = []
+        row_numbers = []
+        
+        for row in rows:
+            result.total += 1
+            ok, payload = _validate_user_row(row, existing, seen)
+            if ok:
+                users.append(payload)
+                row_numbers.append(result.total)
+            else:
+                result.failed += 1
+                result.errors.append({"row": result.total, "email": row.email, "error": payload})
+        
+        # Hash outside the parse loop and across cores; bcrypt dominates this endpoint's cost
+        passwords = [user_row.pop("password") or secrets.token_urlsafe(12) for user_row in users]
+        for user_row, password_hash in zip(users, get_password_hashes(passwords)):
+            user_row["password_hash"] = password_hash
+        _insert_bulk_batch(db, User, users, row_numbers, result)
     
     db.commit()
     return result
@@ -265,7 +372,7 @@ def get_task_templates(
     templates = db.query(TaskTemplate).filter(
         or_(
             TaskTemplate.created_by_id == current_user.id,
-            TaskTemplate.is_global == "true"
+            TaskTemplate.is_global.is_(True)
         )
     ).all()
     return templates
@@ -282,16 +389,20 @@ def create_task_template(
         name=template_data.name,
         description=template_data.description,
         default_priority=template_data.default_priority,
+        task_name_template=template_data.name,
         estimated_hours=template_data.estimated_hours,
         default_tags=template_data.default_tags,
-        checklist_items=template_data.checklist_items,
-        is_global="true" if template_data.is_global else "false",
+        checklist=template_data.checklist_items,
+        is_global=template_data.is_global,
         created_by_id=current_user.id
     )
     db.add(template)
+    # Serialize from the flushed instance: every returned field is set here,
+    # so a post-commit refresh would only repeat a SELECT.
+    db.flush()
+    response = TaskTemplateResponse.model_validate(template)
     db.commit()
-    db.refresh(template)
-    return template
+    return response
 
 
 @router.post("/tasks/from-template/{template_id}")
@@ -304,27 +415,38 @@ def create_task_from_template(
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new task from a template."""
-    template = db.query(TaskTemplate).filter(TaskTemplate.id == template_id).first()
-    if not template:
+    # Copy the template into tasks with a single INSERT ... SELECT ... RETURNING;
+    # no row comes back when the template does not exist
+    now = datetime.utcnow()
+    source = select(
+        literal(str(uuid.uuid4())),
+        TaskTemplate.name,
+        TaskTemplate.description,
+        TaskTemplate.default_priority,
+        literal("todo"),
+        literal(project_id, String),
+        literal(assignee_id, String),
+        literal(current_user.id),
+        cast(TaskTemplate.estimated_hours, Float),
+        TaskTemplate.default_tags,
+        literal(_parse_due_date(due_date) if due_date else None, DateTime),
+        literal(now, DateTime),
+        literal(now, DateTime),
+    ).where(TaskTemplate.id == template_id)
+    created = db.execute(
+        insert(Task).from_select(
+            [
+                "id", "name", "description", "priority", "status", "project_id", "assignee_id",
+                "owner_id", "estimated_hours", "tags", "due_date", "created_at", "updated_at",
+            ],
+            source
+        ).returning(Task.id, Task.name)
+    ).first()
+    if not created:
         raise HTTPException(status_code=404, detail="Template not found")
-    
-    task = Task(
-        name=template.name,
-        description=template.description,
-        priority=template.default_priority,
-        status="todo",
-        project_id=project_id,
-        assignee_id=assignee_id,
-        created_by_id=current_user.id,
-        estimated_hours=float(template.estimated_hours) if template.estimated_hours else None,
-        tags=template.default_tags,
-        due_date=_parse_due_date(due_date) if due_date else None
-    )
-    db.add(task)
     db.commit()
-    db.refresh(task)
     
-    return {"id": task.id, "name": task.name, "message": "Task created from template"}
+    return {"id": created.id, "name": created.name, "message": "Task created from template"}
 
 
 # ==================== SAVED FILTERS ====================
@@ -358,14 +480,15 @@ def create_saved_filter(
         filter_config=filter_data.filter_config,
         sort_config=filter_data.sort_config,
         view_type=filter_data.view_type,
-        is_shared="true" if filter_data.is_shared else "false",
+        is_shared=filter_data.is_shared,
         share_token=share_token,
         user_id=current_user.id
     )
     db.add(saved_filter)
+    db.flush()
+    response = SavedFilterResponse.model_validate(saved_filter)
     db.commit()
-    db.refresh(saved_filter)
-    return saved_filter
+    return response
 
 
 @router.delete("/filters/{filter_id}")
@@ -395,7 +518,7 @@ def get_shared_filter(
     """Get a shared filter by token (public access)."""
     saved_filter = db.query(SavedFilter).filter(
         SavedFilter.share_token == share_token,
-        SavedFilter.is_shared == "true"
+        SavedFilter.is_shared.is_(True)
     ).first()
     if not saved_filter:
         raise HTTPException(status_code=404, detail="Shared filter not found")
@@ -441,9 +564,10 @@ def create_scheduled_report(
         created_by_id=current_user.id
     )
     db.add(report)
+    db.flush()
+    response = {"id": report.id, "name": report.name, "message": "Scheduled report created"}
     db.commit()
-    db.refresh(report)
-    return {"id": report.id, "name": report.name, "message": "Scheduled report created"}
+    return response
 
 
 @router.delete("/scheduled-reports/{report_id}")
@@ -472,42 +596,59 @@ async def export_user_data(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Export all user data for GDPR compliance."""
-    user_data = {
-        "personal_info": {
-            "id": current_user.id,
-            "email": current_user.email,
-            "full_name": current_user.full_name,
-            "position": current_user.position,
-            "phone": current_user.phone,
-            "skills": current_user.skills,
-            "timezone": current_user.timezone,
-            "created_at": str(current_user.created_at),
-        },
-        "tasks": [],
-        "timesheets": [],
-        "comments": []
+    """Export all user data for GDPR compliance (streamed as JSON)."""
+    personal_info = {
+        "id": current_user.id,
+        "email": current_user.email,
+        "full_name": current_user.full_name,
+        "position": current_user.position,
+        "phone": current_user.phone,
+        "skills": current_user.skills,
+        "timezone": current_user.timezone,
+        "created_at": str(current_user.created_at),
     }
+    user_id = current_user.id
+    bind = db.get_bind()
     
-    # Get user's tasks
-    tasks = db.query(Task).filter(Task.assignee_id == current_user.id).all()
-    for task in tasks:
-        user_data["tasks"].append({
-            "id": task.id,
-            "name": task.name,
-            "status": task.status,
-            "created_at": str(task.created_at)
-        })
-    
-    # Get user's timesheets
-    from app.models import Timesheet
-    timesheets = db.query(Timesheet).filter(Timesheet.user_id == current_user.id).all()
-    for ts in timesheets:
-        user_data["timesheets"].append({
-            "id": ts.id,
-            "date": str(ts.week_starting),
-            "hours": ts.total_hours,
-            "status": ts.status
-        })
+    def generate():
+        # The request session is closed before the body streams, so use a
+        # dedicated one on the same bind for the row queries.
+        export_db = Session(bind=bind)
+        try:
+            yield '{"personal_info": ' + json.dumps(personal_info) + ', "tasks": ['
+            
+            # Get user's tasks (column rows, fetched in chunks)
+            tasks = export_db.execute(
+                select(Task.id, Task.name, Task.status, Task.created_at)
+                .where(Task.assignee_id == user_id)
+                .execution_options(yield_per=1000)
+            )
+            for i, task in enumerate(tasks):
+                yield ("," if i else "") + json.dumps({
+                    "id": task.id,
+                    "name": task.name,
+                    "status": task.status,
+                    "created_at": str(task.created_at)
+                })
+            
+            yield '], "timesheets": ['
+            
+            # Get user's timesheets
+            timesheets = export_db.execute(
+                select(Timesheet.id, Timesheet.week_starting, Timesheet.total_hours, Timesheet.status)
+                .where(Timesheet.user_id == user_id)
+                .execution_options(yield_per=1000)
+            )
+            for i, ts in enumerate(timesheets):
+                yield ("," if i else "") + json.dumps({
+                    "id": ts.id,
+                    "date": str(ts.week_starting),
+                    "hours": ts.total_hours,
+                    "status": ts.status
+                })
+            
+            yield '], "comments": []}'
+        finally:
+            export_db.close()
     
-    return user_data
+    return StreamingResponse(generate(), media_type="application/json")
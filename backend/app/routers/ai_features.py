@@ -2,16 +2,28 @@
 from typing import List, Optional
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from pydantic import BaseModel
 
 from app.database import get_db
 from app.models import User, Task, Project, Team
 from app.utils import get_current_active_user
-from app.services.ai_task_service import AITaskService
+from app.services.ai_task_service import (
+    AITaskService,
+    DEADLINE_RISK_COLUMNS,
+    OPEN_TASK_STATUSES,
+    PRIORITY_SCORE_COLUMNS,
+    score_to_priority,
+)
 
 router = APIRouter()
 
+
+def get_ai_service(db: Session = Depends(get_db)) -> AITaskService:
+    """Provide an AITaskService bound to the request's session."""
+    return AITaskService(db)
+
+
 # Schemas
 class TaskPriorityResponse(BaseModel):
     task_id: str
@@ -57,14 +69,19 @@ class AITaskSuggestions(BaseModel):
 def get_smart_priorities(
     project_id: Optional[str] = None,
     team_id: Optional[str] = None,
+    live: bool = False,
     db: Session = Depends(get_db),
+    ai_service: AITaskService = Depends(get_ai_service),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get AI-calculated priority scores for tasks."""
-    ai_service = AITaskService(db)
+    """
+    Get AI-calculated priority scores for tasks.
     
-    query = db.query(Task).filter(
-        Task.status.in_(["todo", "in_progress", "backlog", "waiting", "blocked"])
+    Uses the persisted ai_priority_score (refreshed by the scheduler) to return
+    the 50 highest-scoring tasks; pass live=true to rescore every match now.
+    """
+    query = db.query(Task).options(load_only(*PRIORITY_SCORE_COLUMNS)).filter(
+        Task.status.in_(OPEN_TASK_STATUSES)
     )
     
     if project_id:
@@ -72,45 +89,44 @@ def get_smart_priorities(
     if team_id:
         query = query.filter(Task.team_id == team_id)
     
-    tasks = query.limit(50).all()
-    results = []
+    if live:
+        tasks = query.all()
+        scores = ai_service.score_priorities_batch(tasks)
+    else:
+        scored = query.filter(Task.ai_priority_score.isnot(None)).order_by(
+            Task.ai_priority_score.desc()
+        ).limit(50).all()
+        # Tasks created since the last refresh have no stored score yet; score
+        # them all now so they can still outrank the stored top 50
+        unscored = query.filter(Task.ai_priority_score.is_(None)).all()
+        tasks = scored + unscored
+        scores = [t.ai_priority_score for t in scored] + ai_service.score_priorities_batch(unscored)
     
-    for task in tasks:
-        score = ai_service.calculate_priority_score(task)
-        
-        # Map score to suggested priority
-        if score >= 80:
-            suggested = "urgent"
-        elif score >= 60:
-            suggested = "high"
-        elif score >= 40:
-            suggested = "medium"
-        else:
-            suggested = "low"
-        
-        results.append(TaskPriorityResponse(
+    results = [
+        TaskPriorityResponse(
             task_id=task.id,
             task_name=task.name,
             priority_score=round(score, 1),
             current_priority=task.priority,
-            suggested_priority=suggested
-        ))
+            suggested_priority=score_to_priority(score)
+        )
+        for task, score in zip(tasks, scores)
+    ]
     
     # Sort by priority score descending
     results.sort(key=lambda x: x.priority_score, reverse=True)
-    return results
+    return results[:50]
 
 @router.get("/deadline-risks", response_model=List[DeadlineRiskResponse])
 def get_deadline_risks(
     project_id: Optional[str] = None,
     risk_level: Optional[str] = None,
     db: Session = Depends(get_db),
+    ai_service: AITaskService = Depends(get_ai_service),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get deadline risk predictions for tasks."""
-    ai_service = AITaskService(db)
-    
-    query = db.query(Task).filter(
+    query = db.query(Task).options(load_only(*DEADLINE_RISK_COLUMNS)).filter(
         Task.status.in_(["todo", "in_progress", "waiting", "blocked"]),
         Task.due_date != None
     )
@@ -119,11 +135,10 @@ def get_deadline_risks(
         query = query.filter(Task.project_id == project_id)
     
     tasks = query.limit(50).all()
+    risks = ai_service.predict_deadline_risks_batch(tasks)
     results = []
     
-    for task in tasks:
-        risk = ai_service.predict_deadline_risk(task)
-        
+    for task, risk in zip(tasks, risks):
         if risk_level and risk["risk_level"] != risk_level:
             continue
         
@@ -144,6 +159,7 @@ def get_deadline_risks(
 def get_workload_optimization(
     team_id: str,
     db: Session = Depends(get_db),
+    ai_service: AITaskService = Depends(get_ai_service),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get workload optimization suggestions for a team."""
@@ -151,7 +167,6 @@ def get_workload_optimization(
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    ai_service = AITaskService(db)
     result = ai_service.get_workload_optimization(team_id)
     
     return WorkloadOptimizationResponse(
@@ -165,11 +180,10 @@ def get_workload_optimization(
 async def create_task_from_text(
     data: NLTaskCreate,
     db: Session = Depends(get_db),
+    ai_service: AITaskService = Depends(get_ai_service),
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a task from natural language description."""
-    ai_service = AITaskService(db)
-    
     try:
         task_data = await ai_service.create_task_from_natural_language(data.text, current_user)
         
@@ -181,14 +195,16 @@ async def create_task_from_text(
         
         if data.project_id:
             task_data["project_id"] = data.project_id
+        # Parsers return YYYY-MM-DD; convert here so the response can be built
+        # from the flushed instance without re-reading it from the DB
+        if isinstance(task_data.get("due_date"), str):
+            task_data["due_date"] = datetime.fromisoformat(task_data["due_date"])
         
         # Create the task
         task = Task(**task_data)
         db.add(task)
-        db.commit()
-        db.refresh(task)
-        
-        return NLTaskResponse(
+        db.flush()
+        response = NLTaskResponse(
             success=True,
             task={
                 "id": task.id,
@@ -199,6 +215,9 @@ async def create_task_from_text(
             },
             message="Task created successfully"
         )
+        db.commit()
+        
+        return response
     except Exception as e:
         return NLTaskResponse(
             success=False,
@@ -209,6 +228,7 @@ async def create_task_from_text(
 async def get_task_suggestions(
     task_id: str,
     db: Session = Depends(get_db),
+    ai_service: AITaskService = Depends(get_ai_service),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get AI-powered suggestions for a task."""
@@ -216,7 +236,6 @@ async def get_task_suggestions(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    ai_service = AITaskService(db)
     suggestions = await ai_service.get_ai_suggestions(task)
     
     return AITaskSuggestions(
@@ -228,6 +247,7 @@ async def get_task_suggestions(
 def apply_suggested_priority(
     task_id: str,
     db: Session = Depends(get_db),
+    ai_service: AITaskService = Depends(get_ai_service),
     current_user: User = Depends(get_current_active_user)
 ):
     """Apply AI-suggested priority to a task."""
@@ -235,18 +255,8 @@ def apply_suggested_priority(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    ai_service = AITaskService(db)
     score = ai_service.calculate_priority_score(task)
-    
-    # Map score to priority
-    if score >= 80:
-        new_priority = "urgent"
-    elif score >= 60:
-        new_priority = "high"
-    elif score >= 40:
-        new_priority = "medium"
-    else:
-        new_priority = "low"
+    new_priority = score_to_priority(score)
     
     old_priority = task.priority
     task.priority = new_priority
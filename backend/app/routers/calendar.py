@@ -1,9 +1,10 @@
 """Calendar API router - Task calendar view with date-based filtering."""
 from typing import List, Optional
 from datetime import datetime, date, timedelta
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+import json
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy import DateTime, and_, case, func, literal, null, or_, select, type_coerce, union_all
 from pydantic import BaseModel
 from app.database import get_db
 from app.models import User, Task, Project, Milestone
@@ -54,6 +55,76 @@ STATUS_COLORS = {
 }
 
 
+def _date_range(start_date: date, end_date: date) -> tuple:
+    """Half-open [start, end + 1 day) datetime bounds for an inclusive date range."""
+    return (
+        datetime.combine(start_date, datetime.min.time()),
+        datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+    )
+
+
+def _task_filters(
+    user: User,
+    start_dt: datetime,
+    end_dt: datetime,
+    project_id: Optional[str] = None,
+    assignee_id: Optional[str] = None,
+    include_completed: bool = False
+) -> list:
+    """WHERE clauses selecting the tasks a user sees on the calendar in a range."""
+    # Tasks due or starting in the range, or spanning it entirely
+    filters = [
+        or_(
+            and_(Task.due_date >= start_dt, Task.due_date < end_dt),
+            and_(Task.start_date >= start_dt, Task.start_date < end_dt),
+            and_(Task.start_date <= start_dt, Task.due_date >= end_dt)
+        )
+    ]
+    if project_id:
+        filters.append(Task.project_id == project_id)
+    if assignee_id:
+        filters.append(Task.assignee_id == assignee_id)
+    elif user.role not in ["admin", "manager"]:
+        # Regular users see only their tasks
+        filters.append(Task.assignee_id == user.id)
+    if not include_completed:
+        filters.append(Task.status != "done")
+    return filters
+
+
+def _milestone_filters(start_dt: datetime, end_dt: datetime, project_id: Optional[str] = None) -> list:
+    """WHERE clauses selecting milestones due in a range."""
+    filters = [Milestone.due_date >= start_dt.date(), Milestone.due_date < end_dt.date()]
+    if project_id:
+        filters.append(Milestone.project_id == project_id)
+    return filters
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    """ISO-8601 string for a datetime, as pydantic would emit it."""
+    return value.isoformat() if value else None
+
+
+def _calendar_response(events: List[dict], total: int) -> Response:
+    """
+    Serialize CalendarResponse-shaped event dicts in a single json.dumps pass.
+
+    Events are built as plain dicts with ISO dates, so no CalendarEvent models
+    are created and FastAPI's response_model re-validation and jsonable_encoder
+    pass are skipped; response_model stays on the routes for the schema.
+    """
+    body = json.dumps({"events": events, "total": total}, ensure_ascii=False)
+    return Response(content=body, media_type="application/json")
+
+
+def _page_total(returned: int, skip: int, limit: int, count) -> int:
+    """Total matching rows for a page, only running ``count()`` when the page is full."""
+    if returned < limit and (returned or not skip):
+        # A short, non-empty page (or an empty first page) is the last one
+        return skip + returned
+    return count()
+
+
 @router.get("/tasks", response_model=CalendarResponse)
 def get_calendar_tasks(
     start_date: date = Query(..., description="Start of date range"),
@@ -61,61 +132,58 @@ def get_calendar_tasks(
     project_id: Optional[str] = None,
     assignee_id: Optional[str] = None,
     include_completed: bool = False,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get tasks as calendar events within a date range."""
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(end_date, datetime.max.time())
-    
-    query = db.query(Task).options(
-        joinedload(Task.project),
-        joinedload(Task.assignee)
-    )
-    
-    # Filter by date range - tasks with due_date or start_date in range
-    query = query.filter(
-        or_(
-            and_(Task.due_date >= start_dt, Task.due_date <= end_dt),
-            and_(Task.start_date >= start_dt, Task.start_date <= end_dt),
-            and_(Task.start_date <= start_dt, Task.due_date >= end_dt)
-        )
-    )
+    start_dt, end_dt = _date_range(start_date, end_date)
     
+    # selectinload fetches each related table once by primary key, keeping the
+    # task rows narrow instead of LEFT OUTER JOINing projects and users into them
+    query = db.query(Task).options(selectinload(Task.assignee))
     if project_id:
-        query = query.filter(Task.project_id == project_id)
-    
-    if assignee_id:
-        query = query.filter(Task.assignee_id == assignee_id)
-    elif current_user.role not in ["admin", "manager"]:
-        # Regular users see only their tasks
-        query = query.filter(Task.assignee_id == current_user.id)
+        # Every row shares the one project, so join it in and populate
+        # Task.project from that join rather than issuing a second SELECT
+        query = query.join(Task.project).options(contains_eager(Task.project))
+    else:
+        query = query.options(selectinload(Task.project))
     
-    if not include_completed:
-        query = query.filter(Task.status != "done")
+    query = query.filter(*_task_filters(
+        current_user, start_dt, end_dt, project_id, assignee_id, include_completed
+    ))
     
-    tasks = query.all()
+    tasks = query.order_by(
+        func.coalesce(Task.due_date, Task.start_date, Task.created_at), Task.id
+    ).offset(skip).limit(limit).all()
     
+    # Bind hot lookups to locals; this loop runs once per event in the range
+    priority_color = PRIORITY_COLORS.get
     events = []
+    append = events.append
     for task in tasks:
-        event_date = task.due_date or task.start_date or task.created_at
-        event = CalendarEvent(
-            id=str(task.id),
-            title=task.name,
-            type="task",
-            start=event_date,
-            end=task.due_date if task.start_date else None,
-            all_day=True,
-            color=PRIORITY_COLORS.get(task.priority, "#6b7280"),
-            project_id=str(task.project_id) if task.project_id else None,
-            project_name=task.project.name if task.project else None,
-            status=task.status,
-            priority=task.priority,
-            assignee_name=task.assignee.full_name if task.assignee else None
-        )
-        events.append(event)
+        task_due = task.due_date
+        task_start = task.start_date
+        project = task.project
+        assignee = task.assignee
+        append({
+            "id": str(task.id),
+            "title": task.name,
+            "type": "task",
+            "start": _iso(task_due or task_start or task.created_at),
+            "end": _iso(task_due) if task_start else None,
+            "all_day": True,
+            "color": priority_color(task.priority, "#6b7280"),
+            "project_id": str(task.project_id) if task.project_id else None,
+            "project_name": project.name if project else None,
+            "status": task.status,
+            "priority": task.priority,
+            "assignee_name": assignee.full_name if assignee else None
+        })
     
-    return CalendarResponse(events=events, total=len(events))
+    total = _page_total(len(events), skip, limit, query.count)
+    return _calendar_response(events, total)
 
 
 @router.get("/milestones", response_model=CalendarResponse)
@@ -123,40 +191,48 @@ def get_calendar_milestones(
     start_date: date = Query(..., description="Start of date range"),
     end_date: date = Query(..., description="End of date range"),
     project_id: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get project milestones as calendar events."""
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(end_date, datetime.max.time())
+    start_dt, end_dt = _date_range(start_date, end_date)
     
-    query = db.query(Milestone).options(joinedload(Milestone.project))
-    query = query.filter(
-        Milestone.due_date >= start_dt,
-        Milestone.due_date <= end_dt
+    # Only the columns the events use; the project contributes just its name
+    query = select(
+        Milestone.id,
+        Milestone.name,
+        Milestone.due_date,
+        Milestone.project_id,
+        Milestone.is_completed,
+        Project.name.label("project_name"),
+    ).outerjoin(Project, Milestone.project_id == Project.id).where(
+        *_milestone_filters(start_dt, end_dt, project_id)
     )
     
-    if project_id:
-        query = query.filter(Milestone.project_id == project_id)
-    
-    milestones = query.all()
-    
     events = []
-    for ms in milestones:
-        event = CalendarEvent(
-            id=str(ms.id),
-            title=f"🎯 {ms.name}",
-            type="milestone",
-            start=ms.due_date,
-            all_day=True,
-            color="#8b5cf6",  # Purple for milestones
-            project_id=str(ms.project_id) if ms.project_id else None,
-            project_name=ms.project.name if ms.project else None,
-            status=ms.status
-        )
-        events.append(event)
+    for ms in db.execute(query.order_by(Milestone.due_date, Milestone.id).offset(skip).limit(limit)):
+        events.append({
+            "id": str(ms.id),
+            "title": f"🎯 {ms.name}",
+            "type": "milestone",
+            "start": datetime.combine(ms.due_date, datetime.min.time()).isoformat(),
+            "end": None,
+            "all_day": True,
+            "color": "#8b5cf6",  # Purple for milestones
+            "project_id": str(ms.project_id) if ms.project_id else None,
+            "project_name": ms.project_name,
+            "status": "completed" if ms.is_completed else "pending",
+            "priority": None,
+            "assignee_name": None
+        })
     
-    return CalendarResponse(events=events, total=len(events))
+    total = _page_total(
+        len(events), skip, limit,
+        lambda: db.scalar(select(func.count()).select_from(query.subquery()))
+    )
+    return _calendar_response(events, total)
 
 
 @router.get("/all", response_model=CalendarResponse)
@@ -164,33 +240,75 @@ def get_all_calendar_events(
     start_date: date = Query(..., description="Start of date range"),
     end_date: date = Query(..., description="End of date range"),
     project_id: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all calendar events (tasks + milestones) within date range."""
-    # Get tasks
-    tasks_response = get_calendar_tasks(
-        start_date=start_date,
-        end_date=end_date,
-        project_id=project_id,
-        include_completed=False,
-        db=db,
-        current_user=current_user
+    start_dt, end_dt = _date_range(start_date, end_date)
+    
+    # Tasks and milestones projected to the same event shape and merged with
+    # UNION ALL, so one statement returns every event already sorted by start
+    tasks = select(
+        Task.id.label("id"),
+        Task.name.label("title"),
+        literal("task").label("type"),
+        func.coalesce(Task.due_date, Task.start_date, Task.created_at).label("start"),
+        case((Task.start_date.isnot(None), Task.due_date)).label("end"),
+        Task.project_id,
+        Project.name.label("project_name"),
+        Task.status,
+        Task.priority,
+        User.full_name.label("assignee_name"),
+    ).outerjoin(Project, Task.project_id == Project.id).outerjoin(User, Task.assignee_id == User.id).where(
+        *_task_filters(current_user, start_dt, end_dt, project_id)
     )
     
-    # Get milestones
-    milestones_response = get_calendar_milestones(
-        start_date=start_date,
-        end_date=end_date,
-        project_id=project_id,
-        db=db,
-        current_user=current_user
+    milestones = select(
+        Milestone.id.label("id"),
+        (literal("🎯 ") + Milestone.name).label("title"),
+        literal("milestone").label("type"),
+        type_coerce(Milestone.due_date, DateTime).label("start"),
+        null().label("end"),
+        Milestone.project_id,
+        Project.name.label("project_name"),
+        case((Milestone.is_completed.is_(True), "completed"), else_="pending").label("status"),
+        null().label("priority"),
+        null().label("assignee_name"),
+    ).outerjoin(Project, Milestone.project_id == Project.id).where(
+        *_milestone_filters(start_dt, end_dt, project_id)
     )
     
-    all_events = tasks_response.events + milestones_response.events
-    all_events.sort(key=lambda e: e.start)
+    events_query = union_all(tasks, milestones)
+    events_query = events_query.order_by(
+        events_query.selected_columns.start, events_query.selected_columns.id
+    ).offset(skip).limit(limit)
     
-    return CalendarResponse(events=all_events, total=len(all_events))
+    priority_color = PRIORITY_COLORS.get
+    all_events = [
+        {
+            "id": str(row.id),
+            "title": row.title,
+            "type": row.type,
+            "start": _iso(row.start),
+            "end": _iso(row.end),
+            "all_day": True,
+            "color": priority_color(row.priority, "#6b7280") if row.type == "task" else "#8b5cf6",
+            "project_id": str(row.project_id) if row.project_id else None,
+            "project_name": row.project_name,
+            "status": row.status,
+            "priority": row.priority,
+            "assignee_name": row.assignee_name
+        }
+        for row in db.execute(events_query)
+    ]
+    
+    total = _page_total(
+        len(all_events), skip, limit,
+        lambda: db.scalar(select(func.count()).select_from(union_all(tasks, milestones).subquery()))
+    )
+    return _calendar_response(all_events, total)
 
 
 @router.put("/tasks/{task_id}/reschedule")
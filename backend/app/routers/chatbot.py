@@ -14,21 +14,22 @@ from app.schemas import (
 )
 from app.utils import get_current_active_user
 from app.config import get_settings
+from app.services.dashboard_cache import DashboardCache, invalidate_on_commit
 from datetime import datetime, timedelta, date as date_type
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select, true
 from pydantic import BaseModel, Field
 from typing import List, Optional, Annotated, Any, Dict
 from enum import Enum
-import base64
+import io
 import json
 import uuid
 import os
+import asyncio
+import random
 import re
-
-# LangGraph imports
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+import time
+from collections import ChainMap
+from functools import lru_cache, partial
 
 router = APIRouter()
 settings = get_settings()
@@ -37,6 +38,10 @@ settings = get_settings()
 CHATBOT_UPLOADS_DIR = os.path.join("uploads", "chatbot")
 os.makedirs(CHATBOT_UPLOADS_DIR, exist_ok=True)
 
+# File types the chatbot can extract text from or send to Gemini
+PDF_CONTENT_TYPE = "application/pdf"
+ALLOWED_UPLOAD_TYPES = frozenset({"image/jpeg", "image/png", "image/webp", PDF_CONTENT_TYPE})
+
 
 # =============================================================================
 # SCHEMAS
@@ -78,6 +83,7 @@ class UserContext(BaseModel):
     pending_timesheets: int
     pending_expenses: int
     pending_expense_amount: float
+    pending_expense_amount_display: str  # formatted with currency, e.g. "1,250.00 EGP"
     approved_expenses_month: int
     active_projects: int
     project_names: List[str]
@@ -91,6 +97,8 @@ class UserContext(BaseModel):
 class AgentState(dict):
     """State object that passes through the graph nodes."""
     user_message: str
+    user_first_name: str  # first word of user_context["user_name"]; set by the classifier
+    topic: Optional[str]  # greeting/task/time/expense for the offline fallback; set by the classifier
     user_context: dict
     intent: str
     tool_output: str
@@ -108,54 +116,60 @@ def fetch_user_context(user: User, db: Session) -> UserContext:
     today = datetime.utcnow().date()
     week_start = today - timedelta(days=today.weekday())
     month_start = today.replace(day=1)
+    today_start = datetime.combine(today, datetime.min.time())
 
-    pending_tasks = db.query(Task).filter(
-        Task.status.in_(["open", "in_progress"])
-    ).all()
-
-    user_pending_tasks = [t for t in pending_tasks if t.assignee_id == user.id or (t.task_type == "personal" and t.assignee_id is None)]
-
-    completed = db.query(Task).filter(
+    # Tasks assigned to the user plus unassigned personal tasks
+    user_tasks = or_(
         Task.assignee_id == user.id,
-        Task.status == "completed"
-    ).count()
-
-    high_priority = sum(1 for t in user_pending_tasks if t.priority == "high")
-    overdue = sum(1 for t in user_pending_tasks if hasattr(t, 'due_date') and t.due_date and (t.due_date.date() if hasattr(t.due_date, 'date') else t.due_date) < today)
-    task_list = [{"name": t.name, "status": t.status, "priority": t.priority} for t in user_pending_tasks[:10]]
-
-    hours_week = db.query(func.sum(TimeEntry.hours)).join(Timesheet).filter(
-        Timesheet.user_id == user.id,
-        TimeEntry.day >= week_start
-    ).scalar() or 0.0
-
-    hours_today = db.query(func.sum(TimeEntry.hours)).join(Timesheet).filter(
-        Timesheet.user_id == user.id,
-        TimeEntry.day == today
-    ).scalar() or 0.0
-
-    pending_ts = db.query(Timesheet).filter(
-        Timesheet.user_id == user.id,
-        Timesheet.status == "pending"
-    ).count()
-
-    pending_exp = db.query(Expense).filter(
-        Expense.user_id == user.id,
-        Expense.status == "pending"
-    ).all()
-
-    approved_exp = db.query(Expense).filter(
-        Expense.user_id == user.id,
-        Expense.status == "approved",
-        Expense.created_at >= month_start
-    ).count()
-
-    projects = db.query(Project).filter(Project.status == "active").all()
-
-    tickets = db.query(SupportRequest).filter(
-        SupportRequest.user_id == user.id,
-        SupportRequest.status.in_(["open", "in_progress"])
-    ).count()
+        and_(Task.task_type == "personal", Task.assignee_id.is_(None))
+    )
+    pending = Task.status.in_(["open", "in_progress"])
+    
+    # Every count and sum in one round-trip: conditional aggregates over the
+    # user's tasks, and scalar subqueries for the other tables
+    task_counts = select(
+        func.count().filter(pending).label("pending_tasks"),
+        func.count().filter(and_(pending, Task.priority == "high")).label("high_priority"),
+        func.count().filter(and_(pending, Task.due_date < today_start)).label("overdue"),
+        func.count().filter(and_(Task.assignee_id == user.id, Task.status == "completed")).label("completed"),
+    ).where(user_tasks).subquery()
+    hours = select(
+        func.coalesce(func.sum(TimeEntry.hours).filter(TimeEntry.day >= week_start), 0.0).label("hours_week"),
+        func.coalesce(func.sum(TimeEntry.hours).filter(TimeEntry.day == today), 0.0).label("hours_today"),
+    ).join(Timesheet).where(Timesheet.user_id == user.id).subquery()
+    expenses = select(
+        func.count().filter(Expense.status == "pending").label("pending_expenses"),
+        func.coalesce(func.sum(Expense.total_amount).filter(Expense.status == "pending"), 0.0).label(
+            "pending_expense_amount"
+        ),
+        func.count().filter(and_(Expense.status == "approved", Expense.created_at >= month_start)).label("approved_expenses_month"),
+    ).where(Expense.user_id == user.id).subquery()
+    
+    counts = db.execute(select(
+        task_counts, hours, expenses,
+        select(func.count()).where(
+            Timesheet.user_id == user.id,
+            Timesheet.status == "pending"
+        ).scalar_subquery().label("pending_timesheets"),
+        select(func.count()).where(Project.status == "active").scalar_subquery().label("active_projects"),
+        select(func.count()).where(
+            SupportRequest.user_id == user.id,
+            SupportRequest.status.in_(["open", "in_progress"])
+        ).scalar_subquery().label("open_tickets"),
+    ).select_from(
+        # Each aggregate is a single row, so the cross join is still one row
+        task_counts.join(hours, true()).join(expenses, true())
+    )).one()
+    
+    task_list = [
+        {"name": name, "status": status, "priority": priority}
+        for name, status, priority in db.execute(
+            select(Task.name, Task.status, Task.priority).where(pending, user_tasks).limit(10)
+        )
+    ]
+    project_names = list(db.execute(
+        select(Project.name).where(Project.status == "active").limit(10)
+    ).scalars())
 
     return UserContext(
         user_id=str(user.id),
@@ -163,23 +177,51 @@ def fetch_user_context(user: User, db: Session) -> UserContext:
         user_role=user.role,
         today=today.strftime('%Y-%m-%d'),
         week_start=week_start.strftime('%Y-%m-%d'),
-        pending_tasks=len(user_pending_tasks),
-        high_priority_tasks=high_priority,
-        overdue_tasks=overdue,
-        completed_tasks_week=completed,
+        pending_tasks=counts.pending_tasks,
+        high_priority_tasks=counts.high_priority,
+        overdue_tasks=counts.overdue,
+        completed_tasks_week=counts.completed,
         task_list=task_list,
-        hours_today=float(hours_today),
-        hours_week=float(hours_week),
-        pending_timesheets=pending_ts,
-        pending_expenses=len(pending_exp),
-        pending_expense_amount=sum(e.total_amount or 0 for e in pending_exp),
-        approved_expenses_month=approved_exp,
-        active_projects=len(projects),
-        project_names=[p.name for p in projects[:10]],
-        open_tickets=tickets
+        hours_today=float(counts.hours_today),
+        hours_week=float(counts.hours_week),
+        pending_timesheets=counts.pending_timesheets,
+        pending_expenses=counts.pending_expenses,
+        pending_expense_amount=float(counts.pending_expense_amount),
+        pending_expense_amount_display=f"{counts.pending_expense_amount:,.2f} EGP",
+        approved_expenses_month=counts.approved_expenses_month,
+        active_projects=counts.active_projects,
+        project_names=project_names,
+        open_tickets=counts.open_tickets
     )
 
 
+# Users tend to send several messages in a burst and these numbers move slowly,
+# so each chatbot turn reuses a recent snapshot instead of re-querying
+USER_CONTEXT_TTL_SECONDS = 60
+USER_CONTEXT_CACHE_SIZE = 10_000
+user_context_cache = DashboardCache(ttl_seconds=USER_CONTEXT_TTL_SECONDS, max_entries=USER_CONTEXT_CACHE_SIZE)
+# Entries are dropped when a commit anywhere changes the user's tasks, hours,
+# expenses or tickets; project changes and unassigned personal tasks show up in
+# everyone's context
+invalidate_on_commit(
+    user_context_cache,
+    {Task: "assignee_id", Timesheet: "user_id", Expense: "user_id", SupportRequest: "user_id", User: "id"},
+    global_models=(Project,),
+    unowned_is_global=True
+)
+
+
+def get_user_context(user: User, db: Session) -> UserContext:
+    """Return the user's context, cached per user for USER_CONTEXT_TTL_SECONDS."""
+    # The date is part of the key so "today" numbers roll over at midnight UTC
+    cache_key = ("chatbot_context", str(user.id), datetime.utcnow().date())
+    context = user_context_cache.get(cache_key)
+    if context is None:
+        context = fetch_user_context(user, db)
+        user_context_cache.set(cache_key, context)
+    return context
+
+
 # =============================================================================
 # CHAT HISTORY HELPERS
 # =============================================================================
@@ -222,31 +264,60 @@ def extract_text_from_pdf(pdf_bytes: bytes) -> str:
         return ""
 
 
+@lru_cache(maxsize=1)
+def _get_genai_client():
+    """Shared Gemini client; building one per call re-creates its HTTP session."""
+    from google import genai
+    return genai.Client(api_key=settings.gemini_api_key)
+
+
+# Larger files go through the Gemini File API instead of being base64-inlined
+# into the JSON request body
+GEMINI_INLINE_MAX_BYTES = 4 * 1024 * 1024
+
+
+def generate_with_file(prompt: str, content_bytes: bytes, mime_type: str) -> str:
+    """Run a Gemini prompt over a file and return the raw response text."""
+    from google.genai import types as _gtypes
+    client = _get_genai_client()
+    if len(content_bytes) <= GEMINI_INLINE_MAX_BYTES:
+        part = _gtypes.Part.from_bytes(data=content_bytes, mime_type=mime_type)
+        return client.models.generate_content(model='gemini-2.0-flash-exp', contents=[prompt, part]).text
+
+    uploaded = client.files.upload(file=io.BytesIO(content_bytes), config={"mime_type": mime_type})
+    try:
+        return client.models.generate_content(model='gemini-2.0-flash-exp', contents=[prompt, uploaded]).text
+    finally:
+        try:
+            client.files.delete(name=uploaded.name)
+        except Exception as e:
+            print(f"Gemini file cleanup error: {e}")
+
+
 def analyze_with_gemini(content_bytes: bytes, mime_type: str, prompt: str) -> str:
     """Analyze file content using Gemini vision API."""
     if not settings.gemini_api_key or len(settings.gemini_api_key) < 20:
         return ""
     try:
-        from google import genai as _genai
-        from google.genai import types as _gtypes
-        client = _genai.Client(api_key=settings.gemini_api_key)
-        response = client.models.generate_content(
-            model='gemini-2.0-flash-exp',
-            contents=[prompt, _gtypes.Part.from_bytes(data=content_bytes, mime_type=mime_type)]
-        )
-        return response.text.strip()
+        return generate_with_file(prompt, content_bytes, mime_type).strip()
     except Exception as e:
         print(f"Gemini analysis error: {e}")
         return ""
 
 
+def find_json_block(text: str) -> Optional[str]:
+    """Outermost {...} span of a model reply, which may wrap JSON in prose or fences."""
+    start = text.find("{")
+    end = text.rfind("}")
+    return text[start:end + 1] if start != -1 and end > start else None
+
+
 def extract_structured_data(raw_text: str) -> dict:
     """Use Gemini to extract structured data from raw text."""
     if not raw_text or not settings.gemini_api_key or len(settings.gemini_api_key) < 20:
         return {}
     try:
-        from google import genai as _genai
-        client = _genai.Client(api_key=settings.gemini_api_key)
+        client = _get_genai_client()
 
         prompt = f"""Extract structured financial/document data from this text.
 Return ONLY valid JSON with these keys (use null if not found):
@@ -261,22 +332,61 @@ Text:
 {raw_text[:3000]}"""
 
         response = client.models.generate_content(model='gemini-2.0-flash-exp', contents=prompt)
-        json_match = re.search(r'\{[\s\S]*\}', response.text)
-        if json_match:
-            return json.loads(json_match.group())
+        json_block = find_json_block(response.text)
+        if json_block:
+            return json.loads(json_block)
     except Exception as e:
         print(f"Structured extraction error: {e}")
     return {}
 
 
+# Markdown that clean_text strips, matched in one pass: bold, italic (no space
+# after the opening *, so "* item" stays a bullet), headings, bullets, blank runs
+_MARKDOWN_RE = re.compile(
+    r'\*\*([^*]+)\*\*|\*([^*\s][^*]*)\*|(^#+\s*)|(^\s*[\*\•]\s*)|\n{3,}',
+    re.MULTILINE
+)
+
+
+def _markdown_sub(m: re.Match) -> str:
+    if m.group(1) is not None:
+        return m.group(1)
+    if m.group(2) is not None:
+        return m.group(2)
+    if m.group(3) is not None:
+        return ''
+    if m.group(4) is not None:
+        return '- '
+    return '\n\n'
+
+
 def clean_text(text: str) -> str:
     """Remove markdown formatting from text."""
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
-    text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^\s*[\*\•]\s*', '- ', text, flags=re.MULTILINE)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    return text.strip()
+    if not text:
+        return text
+    # Plain-text replies (fallbacks, most short answers) need no regex pass
+    if '*' not in text and '#' not in text and '•' not in text and '\n\n\n' not in text:
+        return text.strip()
+    return _MARKDOWN_RE.sub(_markdown_sub, text).strip()
+
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> Optional[bytes]:
+    """
+    Read an upload in chunks, returning None as soon as it exceeds max_bytes
+    instead of pulling an oversized file into memory first.
+    """
+    if file.size is not None and file.size > max_bytes:
+        return None
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            return None
+    return bytes(buffer)
 
 
 # =============================================================================
@@ -301,17 +411,37 @@ def sanitize_user_input(message: str) -> str:
     return sanitized[:2000]
 
 
+GEMINI_MAX_ATTEMPTS = 3
+GEMINI_MAX_RETRY_DELAY = 16
+
+
+def _gemini_retry_delay(err: Exception, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying a rate-limited Gemini call, or None when the
+    error is not a rate limit. Honours the RetryInfo delay the API sends with a
+    429, falling back to jittered exponential backoff.
+    """
+    from google.genai import errors as genai_errors
+
+    if not isinstance(err, genai_errors.APIError) or err.code != 429:
+        return None
+    details = err.details.get("error", {}).get("details", []) if isinstance(err.details, dict) else []
+    for detail in details:
+        retry_delay = str(detail.get("retryDelay", "")).rstrip("s")
+        try:
+            return min(GEMINI_MAX_RETRY_DELAY, float(retry_delay))
+        except ValueError:
+            continue
+    return min(GEMINI_MAX_RETRY_DELAY, 2 ** (attempt + 1)) + random.random()
+
+
 def generate_ai_response(user_message: str, context_data: str, system_instruction: str) -> str:
     """Use Gemini AI to generate a natural, conversational response."""
     if not settings.gemini_api_key or len(settings.gemini_api_key) < 20:
         print(f"[Chatbot] No valid API key")
         return ""
     try:
-        from google import genai as _genai
-        import time as time_mod
-        import asyncio
-
-        client = _genai.Client(api_key=settings.gemini_api_key)
+        client = _get_genai_client()
 
         # Sanitize user input before including in prompt
         safe_message = sanitize_user_input(user_message)
@@ -328,28 +458,20 @@ Do NOT use markdown formatting (no **, ##, ``` etc). Use plain text only.
 Keep your response concise but helpful (under 250 words).
 If the user asks follow-up questions, answer based on the data you have."""
 
-        delays = [2, 5, 10]
-        for attempt in range(3):
+        for attempt in range(GEMINI_MAX_ATTEMPTS):
             try:
-                print(f"[Chatbot] Gemini attempt {attempt+1}/3...")
+                print(f"[Chatbot] Gemini attempt {attempt+1}/{GEMINI_MAX_ATTEMPTS}...")
                 response = client.models.generate_content(model='gemini-2.0-flash-exp', contents=prompt)
                 print(f"[Chatbot] Gemini SUCCESS - response length: {len(response.text)}")
                 return response.text.strip()
             except Exception as retry_err:
-                err_str = str(retry_err).lower()
                 print(f"[Chatbot] Gemini attempt {attempt+1} failed: {retry_err}")
-                if ("quota" in err_str or "rate" in err_str or "resource" in err_str or "429" in err_str) and attempt < 2:
-                    print(f"[Chatbot] Rate limited, waiting {delays[attempt]}s before retry...")
-                    # Use asyncio-safe sleep when possible, fallback to sync
-                    try:
-                        loop = asyncio.get_running_loop()
-                        # We're in a sync function called from async context — can't await
-                        # Use time.sleep as fallback (run_in_executor would be ideal)
-                        time_mod.sleep(delays[attempt])
-                    except RuntimeError:
-                        time_mod.sleep(delays[attempt])
-                    continue
-                raise retry_err
+                delay = _gemini_retry_delay(retry_err, attempt)
+                if delay is None or attempt == GEMINI_MAX_ATTEMPTS - 1:
+                    raise
+                print(f"[Chatbot] Rate limited, waiting {delay:.1f}s before retry...")
+                # Endpoints call this from a worker thread, so sleeping is safe
+                time.sleep(delay)
     except Exception as e:
         print(f"AI Response Error: {e}")
     return ""
@@ -357,9 +479,10 @@ If the user asks follow-up questions, answer based on the data you have."""
 
 def build_context_summary(ctx: dict) -> str:
     """Build a readable text summary of the user's data for AI context."""
-    task_details = ""
-    for t in ctx.get("task_list", []):
-        task_details += f'\n  - Task: "{t["name"]}", Status: {t["status"]}, Priority: {t["priority"]}'
+    task_details = "".join([
+        f'\n  - Task: "{t["name"]}", Status: {t["status"]}, Priority: {t["priority"]}'
+        for t in ctx.get("task_list", [])
+    ])
 
     return f"""User: {ctx['user_name']} (Role: {ctx['user_role']})
 Date: {ctx['today']} (Week started: {ctx['week_start']})
@@ -378,7 +501,7 @@ TIME TRACKING:
 
 EXPENSES:
   Pending expense reports: {ctx['pending_expenses']}
-  Pending amount: {ctx['pending_expense_amount']} EGP
+  Pending amount: {ctx['pending_expense_amount_display']}
   Approved this month: {ctx['approved_expenses_month']}
 
 PROJECTS:
@@ -393,21 +516,49 @@ SUPPORT:
 # GRAPH NODES (AI-Powered)
 # =============================================================================
 
+# Intent keywords by category; the classifier runs one alternation regex per
+# category instead of a substring scan per keyword
+INTENT_KEYWORDS = {
+    "email_word": frozenset({"email", "mail", "e-mail"}),
+    "email_action": frozenset({"send", "write", "compose", "draft"}),
+    "email_pattern": frozenset({"email to", "mail to", "send message"}),
+    "file_word": frozenset({"upload", "attach", "scan receipt", "scan document"}),
+    "question_word": frozenset({"about", "what", "tell", "explain", "why", "can you"}),
+    # Topics for the offline fallback reply
+    "task": frozenset({"task"}),
+    "time": frozenset({"hour", "time"}),
+    "expense": frozenset({"expense"}),
+}
+# Fallback topics in priority order when a message mentions several
+CHAT_TOPICS = ("task", "time", "expense")
+# Categories are matched independently, so a phrase in one ("mail to") is still
+# found when it overlaps a keyword of another ("e-mail")
+_INTENT_KEYWORD_RES = {
+    category: re.compile("|".join(re.escape(k) for k in sorted(words)))
+    for category, words in INTENT_KEYWORDS.items()
+}
+
+# Greeting at the start of a message ("hi", "hey there", "good morning, ...")
+_GREETING_RE = re.compile(r"(?:hi|hello|hey|howdy|good\s+(?:morning|afternoon|evening))\b")
+
+
 def intent_classifier_node(state: AgentState) -> AgentState:
     """Classify user intent — simplified to 3 routes."""
     message = state["user_message"].lower().strip()
+    hits = {category for category, pattern in _INTENT_KEYWORD_RES.items() if pattern.search(message)}
+    state["user_first_name"] = state["user_context"]["user_name"].strip().partition(" ")[0]
+    state["topic"] = "greeting" if _GREETING_RE.match(message) else next(
+        (topic for topic in CHAT_TOPICS if topic in hits), None
+    )
 
     # Email composition
-    email_words = ["email", "mail", "e-mail"]
-    action_words = ["send", "write", "compose", "draft"]
-    email_patterns = ["email to", "mail to", "send message"]
-    if (any(w in message for w in email_words) and any(w in message for w in action_words)) or any(p in message for p in email_patterns):
+    if ("email_word" in hits and "email_action" in hits) or "email_pattern" in hits:
         state["intent"] = "email"
         state["needs_ai"] = True
         return state
 
     # File upload guidance
-    if any(w in message for w in ["upload", "attach", "scan receipt", "scan document"]) and not any(w in message for w in ["about", "what", "tell", "explain", "why", "can you"]):
+    if "file_word" in hits and "question_word" not in hits:
         state["intent"] = "file_help"
         state["needs_ai"] = True
         return state
@@ -418,6 +569,16 @@ def intent_classifier_node(state: AgentState) -> AgentState:
     return state
 
 
+# Offline replies by classifier topic, filled from the user context
+FALLBACK_REPLIES = {
+    "greeting": "Hello {name}! You have {pending_tasks} pending tasks ({high_priority_tasks} high priority, {overdue_tasks} overdue), {hours_week} hours this week, and {pending_expenses} pending expenses. What would you like to know?",
+    "task": "Your tasks, {name}:\n\n{tasks}\n\n{pending_tasks} pending ({high_priority_tasks} high priority, {overdue_tasks} overdue).",
+    "time": "{name}, you've logged {hours_today} hours today and {hours_week} hours this week. {pending_timesheets} pending timesheets.",
+    "expense": "{name}, you have {pending_expenses} pending expense reports ({pending_expense_amount_display}). {approved_expenses_month} approved this month.",
+    None: "Hi {name}! I have your data: {pending_tasks} pending tasks, {hours_week} hours this week, {pending_expenses} pending expenses. Ask me anything!",
+}
+
+
 def unified_ai_node(state: AgentState) -> AgentState:
     """Main AI node: handles ALL queries using Gemini with full database context."""
     ctx = state["user_context"]
@@ -447,20 +608,12 @@ NEVER give the exact same response twice — always tailor your answer to the sp
         state["tool_output"] = ai_response
     else:
         # Smart fallback if AI is unavailable
-        name = ctx["user_name"].split()[0]
-        msg = state["user_message"].lower()
-
-        if any(g in msg for g in ["hi", "hello", "hey", "good morning"]):
-            state["tool_output"] = f"Hello {name}! You have {ctx['pending_tasks']} pending tasks ({ctx['high_priority_tasks']} high priority, {ctx['overdue_tasks']} overdue), {ctx['hours_week']} hours this week, and {ctx['pending_expenses']} pending expenses. What would you like to know?"
-        elif "task" in msg:
-            tasks = "\n".join([f"  - {t['name']} ({t['priority']} priority, {t['status']})" for t in ctx["task_list"][:10]])
-            state["tool_output"] = f"Your tasks, {name}:\n\n{tasks}\n\n{ctx['pending_tasks']} pending ({ctx['high_priority_tasks']} high priority, {ctx['overdue_tasks']} overdue)."
-        elif "hour" in msg or "time" in msg:
-            state["tool_output"] = f"{name}, you've logged {ctx['hours_today']} hours today and {ctx['hours_week']} hours this week. {ctx['pending_timesheets']} pending timesheets."
-        elif "expense" in msg:
-            state["tool_output"] = f"{name}, you have {ctx['pending_expenses']} pending expense reports ({ctx['pending_expense_amount']} EGP). {ctx['approved_expenses_month']} approved this month."
-        else:
-            state["tool_output"] = f"Hi {name}! I have your data: {ctx['pending_tasks']} pending tasks, {ctx['hours_week']} hours this week, {ctx['pending_expenses']} pending expenses. Ask me anything!"
+        topic = state["topic"]
+        fields = {"name": state["user_first_name"]}
+        if topic == "task":
+            fields["tasks"] = "\n".join([f"  - {t['name']} ({t['priority']} priority, {t['status']})" for t in ctx["task_list"][:10]])
+        template = FALLBACK_REPLIES.get(topic, FALLBACK_REPLIES[None])
+        state["tool_output"] = template.format_map(ChainMap(fields, ctx))
 
     return state
 
@@ -513,8 +666,11 @@ def route_by_intent(state: AgentState) -> str:
     return "unified_ai"
 
 
-def build_agent_graph() -> StateGraph:
+def build_agent_graph():
     """Build the LangGraph state machine."""
+    # LangGraph pulls in a large import tree; load it only when a chat needs it
+    from langgraph.graph import StateGraph, END
+
     workflow = StateGraph(AgentState)
     workflow.add_node("intent_classifier", intent_classifier_node)
     workflow.add_node("unified_ai", unified_ai_node)
@@ -535,7 +691,10 @@ def build_agent_graph() -> StateGraph:
     return workflow.compile()
 
 
-agent = build_agent_graph()
+@lru_cache(maxsize=1)
+def get_agent():
+    """Compile the agent graph on first use and reuse it afterwards."""
+    return build_agent_graph()
 
 
 # =============================================================================
@@ -547,7 +706,7 @@ async def get_context(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    return fetch_user_context(current_user, db)
+    return get_user_context(current_user, db)
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -565,10 +724,12 @@ async def chat(
         )
 
     save_chat_message(db, str(current_user.id), "user", message.message)
-    context = fetch_user_context(current_user, db)
+    context = get_user_context(current_user, db)
 
     initial_state = AgentState(
         user_message=message.message,
+        user_first_name="",
+        topic=None,
         user_context=context.model_dump(),
         intent="",
         tool_output="",
@@ -578,7 +739,7 @@ async def chat(
     )
 
     try:
-        result = agent.invoke(initial_state)
+        result = await asyncio.get_running_loop().run_in_executor(None, get_agent().invoke, initial_state)
         response_text = result.get("final_response", "I'm not sure how to help.")
         intent = result.get("intent", "unknown")
 
@@ -623,20 +784,20 @@ async def chat_with_files(
     current_user: User = Depends(get_current_active_user)
 ):
     """Chat with multiple file attachments."""
+    loop = asyncio.get_running_loop()
     if len(files) > 5:
         raise HTTPException(400, "Maximum 5 files allowed per request.")
 
-    allowed_types = ["image/jpeg", "image/png", "image/webp", "application/pdf"]
     file_results = []
     attachment_list = []
 
     for file in files:
-        if file.content_type not in allowed_types:
+        if file.content_type not in ALLOWED_UPLOAD_TYPES:
             file_results.append(f"x {file.filename}: Unsupported format ({file.content_type})")
             continue
 
-        content = await file.read()
-        if len(content) > 10 * 1024 * 1024:
+        content = await read_upload(file)
+        if content is None:
             file_results.append(f"x {file.filename}: Too large (max 10MB)")
             continue
 
@@ -653,19 +814,19 @@ async def chat_with_files(
             "size": len(content)
         })
 
-        if file.content_type == "application/pdf":
+        if file.content_type == PDF_CONTENT_TYPE:
             pdf_text = extract_text_from_pdf(content)
             if pdf_text:
-                structured = extract_structured_data(pdf_text)
+                structured = await loop.run_in_executor(None, extract_structured_data, pdf_text)
                 if structured:
                     result = f"PDF {file.filename}:\nVendor: {structured.get('vendor_name', 'N/A')}\nDate: {structured.get('date', 'N/A')}\nAmount: {structured.get('total_amount', 'N/A')} {structured.get('currency', 'EGP')}\nCategory: {structured.get('category', 'N/A')}\nDescription: {structured.get('description', 'N/A')}"
                 else:
                     result = f"PDF {file.filename}:\n{pdf_text[:500]}..."
             else:
-                gemini_result = analyze_with_gemini(content, file.content_type, f"Analyze this document. {message}")
+                gemini_result = await loop.run_in_executor(None, analyze_with_gemini, content, file.content_type, f"Analyze this document. {message}")
                 result = f"PDF {file.filename}:\n{clean_text(gemini_result) if gemini_result else 'Could not extract text.'}"
         else:
-            gemini_result = analyze_with_gemini(content, file.content_type, f"Analyze this image/document. {message}. Extract text, amounts, dates, vendor names.")
+            gemini_result = await loop.run_in_executor(None, analyze_with_gemini, content, file.content_type, f"Analyze this image/document. {message}. Extract text, amounts, dates, vendor names.")
             result = f"Image {file.filename}:\n{clean_text(gemini_result) if gemini_result else 'Could not analyze.'}"
 
         file_results.append(result)
@@ -686,45 +847,45 @@ async def scan_documents(
     current_user: User = Depends(get_current_active_user)
 ):
     """Batch scan PDFs and images, extracting structured data."""
+    loop = asyncio.get_running_loop()
     if len(files) > 5:
         raise HTTPException(400, "Maximum 5 files allowed.")
 
-    allowed_types = ["image/jpeg", "image/png", "image/webp", "application/pdf"]
     results = []
 
     for file in files:
-        if file.content_type not in allowed_types:
+        if file.content_type not in ALLOWED_UPLOAD_TYPES:
             results.append(DocumentScanResult(file_name=file.filename or "unknown", file_type=file.content_type or "unknown", description=f"Unsupported: {file.content_type}"))
             continue
 
-        content = await file.read()
-        if len(content) > 10 * 1024 * 1024:
+        content = await read_upload(file)
+        if content is None:
             results.append(DocumentScanResult(file_name=file.filename or "unknown", file_type=file.content_type or "unknown", description="Too large (max 10MB)"))
             continue
 
-        file_type = "pdf" if file.content_type == "application/pdf" else "image"
+        file_type = "pdf" if file.content_type == PDF_CONTENT_TYPE else "image"
         raw_text = ""
         structured = {}
 
-        if file.content_type == "application/pdf":
+        if file.content_type == PDF_CONTENT_TYPE:
             raw_text = extract_text_from_pdf(content)
             if raw_text:
-                structured = extract_structured_data(raw_text)
+                structured = await loop.run_in_executor(None, extract_structured_data, raw_text)
             else:
-                gemini_text = analyze_with_gemini(content, file.content_type, "Extract ALL text from this document. Also extract: vendor_name, date, total_amount, currency, category, description as JSON.")
+                gemini_text = await loop.run_in_executor(None, analyze_with_gemini, content, file.content_type, "Extract ALL text from this document. Also extract: vendor_name, date, total_amount, currency, category, description as JSON.")
                 if gemini_text:
                     raw_text = gemini_text
-                    json_match = re.search(r'\{[\s\S]*\}', gemini_text)
-                    if json_match:
-                        try: structured = json.loads(json_match.group())
+                    json_block = find_json_block(gemini_text)
+                    if json_block:
+                        try: structured = json.loads(json_block)
                         except json.JSONDecodeError: pass
         else:
-            gemini_text = analyze_with_gemini(content, file.content_type, "Extract ALL text from this image. Also identify: vendor_name, date, total_amount, currency, category, description. Return as JSON.")
+            gemini_text = await loop.run_in_executor(None, analyze_with_gemini, content, file.content_type, "Extract ALL text from this image. Also identify: vendor_name, date, total_amount, currency, category, description. Return as JSON.")
             if gemini_text:
                 raw_text = gemini_text
-                json_match = re.search(r'\{[\s\S]*\}', gemini_text)
-                if json_match:
-                    try: structured = json.loads(json_match.group())
+                json_block = find_json_block(gemini_text)
+                if json_block:
+                    try: structured = json.loads(json_block)
                     except json.JSONDecodeError: pass
 
         results.append(DocumentScanResult(
@@ -802,20 +963,20 @@ async def analyze_file(
     current_user: User = Depends(get_current_active_user)
 ):
     """Analyze uploaded file using AI with PDF text extraction."""
-    allowed_types = ["image/jpeg", "image/png", "image/webp", "application/pdf"]
-    if file.content_type not in allowed_types:
+    loop = asyncio.get_running_loop()
+    if file.content_type not in ALLOWED_UPLOAD_TYPES:
         raise HTTPException(400, f"Unsupported: {file.content_type}")
 
-    content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
+    content = await read_upload(file)
+    if content is None:
         raise HTTPException(400, "File too large (max 10MB).")
 
-    file_type = "pdf" if file.content_type == "application/pdf" else "image"
+    file_type = "pdf" if file.content_type == PDF_CONTENT_TYPE else "image"
 
-    if file.content_type == "application/pdf":
+    if file.content_type == PDF_CONTENT_TYPE:
         pdf_text = extract_text_from_pdf(content)
         if pdf_text:
-            structured = extract_structured_data(pdf_text)
+            structured = await loop.run_in_executor(None, extract_structured_data, pdf_text)
             if structured:
                 return FileAnalysisResponse(
                     success=True, message="PDF analyzed",
@@ -835,21 +996,16 @@ async def analyze_file(
         ), file_type=file_type)
 
     try:
-        from google import genai as _genai
-        from google.genai import types as _gtypes
-        client = _genai.Client(api_key=settings.gemini_api_key)
-        response = client.models.generate_content(
-            model='gemini-2.0-flash-exp',
-            contents=[
-                "Analyze this receipt/document. Extract: vendor_name, date (YYYY-MM-DD), total_amount, currency, category, description. Return as JSON.",
-                _gtypes.Part.from_bytes(data=content, mime_type=file.content_type or "image/jpeg")
-            ]
+        response_text = await loop.run_in_executor(
+            None, generate_with_file,
+            "Analyze this receipt/document. Extract: vendor_name, date (YYYY-MM-DD), total_amount, currency, category, description. Return as JSON.",
+            content, file.content_type or "image/jpeg"
         )
-        json_match = re.search(r'\{[\s\S]*\}', response.text)
-        if json_match:
-            data = json.loads(json_match.group())
+        json_block = find_json_block(response_text)
+        if json_block:
+            data = json.loads(json_block)
             return FileAnalysisResponse(success=True, message="Analyzed", extracted_data=ExtractedExpenseData(**data), file_type=file_type)
-        return FileAnalysisResponse(success=True, message="Analyzed", summary=clean_text(response.text), file_type=file_type)
+        return FileAnalysisResponse(success=True, message="Analyzed", summary=clean_text(response_text), file_type=file_type)
     except Exception as e:
         return FileAnalysisResponse(success=False, message="Analysis failed. Please try again.", file_type=file_type)
 
@@ -862,22 +1018,24 @@ async def chat_with_file(
     current_user: User = Depends(get_current_active_user)
 ):
     """Chat about an uploaded file."""
-    allowed_types = ["image/jpeg", "image/png", "image/webp", "application/pdf"]
-    if file.content_type not in allowed_types:
+    loop = asyncio.get_running_loop()
+    if file.content_type not in ALLOWED_UPLOAD_TYPES:
         return ChatResponse(response=f"Sorry, I cannot process {file.content_type} files.", context_used="file_error")
 
-    content = await file.read()
+    content = await read_upload(file)
+    if content is None:
+        return ChatResponse(response=f"Sorry, {file.filename} is too large (max 10MB).", context_used="file_error")
 
-    if file.content_type == "application/pdf":
+    if file.content_type == PDF_CONTENT_TYPE:
         pdf_text = extract_text_from_pdf(content)
         if pdf_text and settings.gemini_api_key and len(settings.gemini_api_key) >= 20:
             try:
-                from google import genai as _genai
-                client = _genai.Client(api_key=settings.gemini_api_key)
-                response = client.models.generate_content(
+                client = _get_genai_client()
+                response = await loop.run_in_executor(None, partial(
+                    client.models.generate_content,
                     model='gemini-2.0-flash-exp',
                     contents=f"Based on this document text, respond to: {message}\n\nDocument:\n{pdf_text[:4000]}\n\nRespond clearly. No markdown."
-                )
+                ))
                 reply = clean_text(response.text)
                 save_chat_message(db, str(current_user.id), "user", message, attachments=[{"fileName": file.filename, "fileType": file.content_type}])
                 save_chat_message(db, str(current_user.id), "assistant", reply, metadata={"intent": "file_analysis"})
@@ -893,17 +1051,12 @@ async def chat_with_file(
         return ChatResponse(response=f"Received {file.filename}. Configure GEMINI_API_KEY for AI analysis.", context_used="demo")
 
     try:
-        from google import genai as _genai
-        from google.genai import types as _gtypes
-        client = _genai.Client(api_key=settings.gemini_api_key)
-        response = client.models.generate_content(
-            model='gemini-2.0-flash-exp',
-            contents=[
-                f"Analyze this and respond to: {message}\nNo markdown.",
-                _gtypes.Part.from_bytes(data=content, mime_type=file.content_type or "image/jpeg")
-            ]
+        response_text = await loop.run_in_executor(
+            None, generate_with_file,
+            f"Analyze this and respond to: {message}\nNo markdown.",
+            content, file.content_type or "image/jpeg"
         )
-        reply = clean_text(response.text)
+        reply = clean_text(response_text)
         save_chat_message(db, str(current_user.id), "user", message, attachments=[{"fileName": file.filename, "fileType": file.content_type}])
         save_chat_message(db, str(current_user.id), "assistant", reply, metadata={"intent": "file_analysis"})
         return ChatResponse(response=reply, context_used="file_analysis")
@@ -1,6 +1,7 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, exists, select, update
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.database import get_db
@@ -8,6 +9,7 @@ from app.models import Client, User, Project, ProjectManager
 from app.schemas import ClientCreate, ClientUpdate, ClientResponse
 from app.utils import get_current_active_user
 from app.utils.role_guards import is_admin, is_manager
+from app.utils.pagination import paginate_by_name
 from app.utils.tenant import scope_to_org, set_org_id
 import csv
 import io
@@ -43,15 +45,21 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ClientResponse])
 def get_all_clients(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     region: str = None,
     sector: str = None,
     search: str = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all clients with optional filters."""
+    """Get all clients with optional filters.
+    
+    Ordered by name; pass the previous page's ``X-Next-Cursor`` header as
+    ``cursor`` to page without OFFSET.
+    """
     query = db.query(Client)
     # Tenant isolation
     query = scope_to_org(query, Client, current_user)
@@ -61,7 +69,7 @@ def get_all_clients(
         query = query.filter(Client.business_sector == sector)
     if search:
         query = query.filter(Client.name.ilike(f"%{search}%"))
-    return query.offset(skip).limit(limit).all()
+    return paginate_by_name(query, Client, response, limit, skip, cursor)
 
 
 @router.post("/bulk-delete", response_model=BulkDeleteResult)
@@ -130,9 +138,12 @@ def create_client(
     db_client = Client(**client_data.model_dump())
     set_org_id(db_client, current_user)
     db.add(db_client)
+    db.flush()
+    # Every response field is already on the flushed instance; building it
+    # before commit avoids the reload a refresh or post-commit access would do
+    response = ClientResponse.model_validate(db_client)
     db.commit()
-    db.refresh(db_client)
-    return db_client
+    return response
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
@@ -158,17 +169,21 @@ def update_client(
     """Update a client. Requires manager+ role."""
     if not is_manager(current_user):
         raise HTTPException(status_code=403, detail="Manager or admin access required")
-    client = db.query(Client).filter(Client.id == client_id).first()
+    update_data = client_data.model_dump(exclude_unset=True)
+    if update_data:
+        # UPDATE ... RETURNING writes and reads back the row in one statement
+        client = db.execute(
+            update(Client).where(Client.id == client_id).values(**update_data).returning(Client)
+        ).scalar_one_or_none()
+    else:
+        client = db.get(Client, client_id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     
-    update_data = client_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(client, field, value)
-    
+    # Built before commit, which would expire the row and force a reload
+    response = ClientResponse.model_validate(client)
     db.commit()
-    db.refresh(client)
-    return client
+    return response
 
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -180,11 +195,12 @@ def delete_client(
     """Delete a client. Requires admin role."""
     if not is_admin(current_user):
         raise HTTPException(status_code=403, detail="Admin access required")
-    client = db.query(Client).filter(Client.id == client_id).first()
-    if not client:
+    # Unlink projects as the ORM delete would, then delete the client by id;
+    # the DELETE's rowcount doubles as the existence check
+    db.execute(update(Project).where(Project.client_id == client_id).values(client_id=None))
+    if db.execute(delete(Client).where(Client.id == client_id)).rowcount == 0:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Client not found")
-    
-    db.delete(client)
     db.commit()
     return None
 
@@ -196,8 +212,7 @@ def get_client_projects(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all projects linked to a specific client."""
-    client = db.query(Client).filter(Client.id == client_id).first()
-    if not client:
+    if not db.scalar(select(exists().where(Client.id == client_id))):
         raise HTTPException(status_code=404, detail="Client not found")
 
     projects = db.query(Project).filter(Project.client_id == client_id).all()
@@ -1,30 +1,53 @@
 """Cost Center Router - CRUD operations for cost centers."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from contextlib import contextmanager
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import CostCenter, User
 from app.schemas import CostCenterCreate, CostCenterUpdate, CostCenterResponse
 from app.utils import get_current_active_user
+from app.utils.pagination import paginate_by_name
 
 router = APIRouter()
 
 
+@contextmanager
+def _unique_code_guard(db: Session):
+    """Report a clash on the unique ``code`` column inside the block as a 400.
+
+    The unique index is the duplicate check: it holds under concurrent
+    writes, where a SELECT beforehand could pass for both requests.
+    """
+    try:
+        yield
+    except IntegrityError as e:
+        db.rollback()
+        message = str(e.orig).lower()
+        if "code" in message and ("unique" in message or "duplicate" in message):
+            raise HTTPException(status_code=400, detail="Cost center code already exists")
+        raise
+
+
 @router.get("/", response_model=List[CostCenterResponse])
 def get_cost_centers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     include_inactive: bool = False,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all cost centers."""
+    """Get all cost centers, ordered by name (``cursor`` pages via ``X-Next-Cursor``)."""
     query = db.query(CostCenter)
     
     if not include_inactive:
         query = query.filter(CostCenter.is_active == True)
     
-    return query.order_by(CostCenter.name).offset(skip).limit(limit).all()
+    return paginate_by_name(query, CostCenter, response, limit, skip, cursor)
 
 
 @router.get("/{cost_center_id}", response_model=CostCenterResponse)
@@ -50,16 +73,15 @@ def create_cost_center(
     if current_user.role not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Admin/Manager access required")
     
-    # Check for duplicate code
-    existing = db.query(CostCenter).filter(CostCenter.code == data.code).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Cost center code already exists")
-    
     cost_center = CostCenter(**data.model_dump())
     db.add(cost_center)
-    db.commit()
-    db.refresh(cost_center)
-    return cost_center
+    with _unique_code_guard(db):
+        # The INSERT returns created_at (eager_defaults on the model), so the
+        # response is complete without a refresh
+        db.flush()
+        response = CostCenterResponse.model_validate(cost_center)
+        db.commit()
+    return response
 
 
 @router.put("/{cost_center_id}", response_model=CostCenterResponse)
@@ -73,23 +95,23 @@ def update_cost_center(
     if current_user.role not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Admin/Manager access required")
     
-    cost_center = db.query(CostCenter).filter(CostCenter.id == cost_center_id).first()
-    if not cost_center:
-        raise HTTPException(status_code=404, detail="Cost center not found")
-    
-    # Check for duplicate code if code is being updated
-    if data.code and data.code != cost_center.code:
-        existing = db.query(CostCenter).filter(CostCenter.code == data.code).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Cost center code already exists")
-    
     update_data = data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(cost_center, key, value)
-    
-    db.commit()
-    db.refresh(cost_center)
-    return cost_center
+    with _unique_code_guard(db):
+        if update_data:
+            # UPDATE ... RETURNING writes and reads back the row in one statement
+            cost_center = db.execute(
+                update(CostCenter).where(CostCenter.id == cost_center_id)
+                .values(**update_data).returning(CostCenter)
+            ).scalar_one_or_none()
+        else:
+            cost_center = db.get(CostCenter, cost_center_id)
+        if not cost_center:
+            raise HTTPException(status_code=404, detail="Cost center not found")
+        
+        # Built before commit, which would expire the row and force a reload
+        response = CostCenterResponse.model_validate(cost_center)
+        db.commit()
+    return response
 
 
 @router.delete("/{cost_center_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -102,11 +124,11 @@ def delete_cost_center(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    cost_center = db.query(CostCenter).filter(CostCenter.id == cost_center_id).first()
-    if not cost_center:
+    # Soft delete by deactivating; the UPDATE's rowcount doubles as the existence check
+    result = db.execute(
+        update(CostCenter).where(CostCenter.id == cost_center_id).values(is_active=False)
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Cost center not found")
-    
-    # Soft delete by deactivating
-    cost_center.is_active = False
     db.commit()
     return None
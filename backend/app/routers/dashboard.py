@@ -2,15 +2,17 @@
 Dashboard Router
 Personal, Manager, and Executive dashboards with real database data.
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta, date
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy import func, desc, and_, or_, case, literal, select, union_all
 from pydantic import BaseModel
 from app.database import get_db
 from app.models import Task, Timesheet, TimeEntry, User, Department, TaskStatus, Project, TimeLog, ProjectManager
 from app.utils import get_current_active_user
+from app.services.dashboard_cache import dashboard_cache
 
 router = APIRouter()
 
@@ -67,10 +69,48 @@ class WeeklySummaryResponse(BaseModel):
     productivity_trend: str
 
 
+# Browsers may keep dashboard bodies but must revalidate them with If-None-Match
+DASHBOARD_CACHE_CONTROL = "private, no-cache"
+
+
+def _serialize(model: BaseModel) -> Tuple[str, str]:
+    """
+    JSON body and ETag for a dashboard response model.
+
+    pydantic-core writes the JSON in one pass; returning the model instead
+    would dump it to a dict, re-validate it against response_model and then
+    json.dumps it. response_model stays on the routes for the schema, and the
+    dashboard cache stores this pair so hits skip serialization.
+    """
+    body = model.model_dump_json()
+    etag = '"' + hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest() + '"'
+    return body, etag
+
+
+def _json_response(request: Request, serialized: Tuple[str, str]) -> Response:
+    """Return the body, or an empty 304 when the client already has it."""
+    body, etag = serialized
+    headers = {"ETag": etag, "Cache-Control": DASHBOARD_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # =============== Personal Dashboard ===============
 
+def _day_start(day: date) -> datetime:
+    """Midnight at the start of day.
+
+    Date filters compare the raw column against ``[_day_start(first),
+    _day_start(last + 1 day))`` rather than wrapping it in func.date(), so the
+    (user, date) indexes can serve them as range scans.
+    """
+    return datetime.combine(day, datetime.min.time())
+
+
 @router.get("/personal", response_model=PersonalDashboardResponse)
 def get_personal_dashboard(
+    request: Request,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     search: Optional[str] = None,
@@ -83,6 +123,11 @@ def get_personal_dashboard(
     - start_date: Filter tasks starting from this date (YYYY-MM-DD)
     - end_date: Filter tasks up to this date (YYYY-MM-DD). Defaults to start_date if not provided.
     """
+    cache_key = ("personal", current_user.id, datetime.utcnow().date(), start_date, end_date, search)
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached)
+
     try:
         today = datetime.utcnow().date()
         now = datetime.utcnow()
@@ -103,153 +148,147 @@ def get_personal_dashboard(
             return query
 
         # Base task filter (always scoped to the current user)
-        base_q = db.query(Task).filter(Task.assignee_id == current_user.id)
+        task_filters = [Task.assignee_id == current_user.id]
         if search:
             search_term = f"%{search.lower()}%"
-            base_q = base_q.filter(
+            task_filters.append(
                 or_(
                     func.lower(Task.name).like(search_term),
                     func.lower(Task.description).like(search_term)
                 )
             )
 
-        # My Tasks count
-        if filter_start and filter_end:
-            my_tasks_count = base_q.filter(
-                or_(
-                    and_(Task.created_at >= filter_start, Task.created_at <= filter_end),
-                    and_(Task.due_date >= filter_start, Task.due_date <= filter_end)
-                )
-            ).count()
-        else:
-            my_tasks_count = base_q.count()
-
-        # Tasks due today (always today regardless of filter, for contextual info)
-        today_start = datetime.combine(today, datetime.min.time())
-        today_end = datetime.combine(today, datetime.max.time())
-        today_tasks_count = db.query(Task).filter(
-            Task.assignee_id == current_user.id,
-            Task.due_date >= today_start,
-            Task.due_date <= today_end,
-            Task.status != TaskStatus.COMPLETED.value
-        ).count()
-
-        # Due tasks (non-completed, non-overdue, non-cancelled)
-        due_q = base_q.filter(
-            Task.status != TaskStatus.COMPLETED.value,
-            Task.status != TaskStatus.OVERDUE.value,
-            Task.status != TaskStatus.CANCELLED.value
-        )
-        if filter_start and filter_end:
-            due_q = due_q.filter(
-                or_(
-                    and_(Task.created_at >= filter_start, Task.created_at <= filter_end),
-                    and_(Task.due_date >= filter_start, Task.due_date <= filter_end)
-                )
-            )
-        due_tasks_count = due_q.count()
-
-        # Overdue tasks
-        overdue_q = base_q.filter(Task.status == TaskStatus.OVERDUE.value)
+        # Tasks created or due inside the window (no-op without a window)
+        window_filters = []
+        completed_window_filters = []
         if filter_start and filter_end:
-            overdue_q = overdue_q.filter(
+            window_filters.append(
                 or_(
                     and_(Task.created_at >= filter_start, Task.created_at <= filter_end),
                     and_(Task.due_date >= filter_start, Task.due_date <= filter_end)
                 )
             )
-        overdue_tasks_count = overdue_q.count()
-
-        # Completed tasks
-        completed_q = base_q.filter(Task.status == TaskStatus.COMPLETED.value)
-        if filter_start and filter_end:
-            completed_q = completed_q.filter(
+            completed_window_filters.append(
                 or_(
                     and_(Task.completed_at >= filter_start, Task.completed_at <= filter_end),
                     and_(Task.created_at >= filter_start, Task.created_at <= filter_end)
                 )
             )
-        completed_tasks_count = completed_q.count()
 
-        # Completed today (for time status section, always "today")
-        completed_today_count = db.query(Task).filter(
-            Task.assignee_id == current_user.id,
-            Task.status == TaskStatus.COMPLETED.value,
-            func.date(Task.completed_at) == today
-        ).count()
+        def task_count(*criteria):
+            return select(func.count(Task.id)).where(*criteria).scalar_subquery()
+
+        today_start = _day_start(today)
+        tomorrow_start = today_start + timedelta(days=1)
+        week_start_dt = _day_start(week_start)
+
+        # This week's hours from time logs and timesheet entries in one CTE,
+        # each row flagged with its hours again if it falls on today; the
+        # today and week totals are both sums over it
+        hours = union_all(
+            select(
+                TimeLog.hours.label("hours"),
+                case((TimeLog.date >= today_start, TimeLog.hours), else_=0.0).label("today_hours")
+            ).where(
+                TimeLog.user_id == current_user.id,
+                TimeLog.date >= week_start_dt,
+                TimeLog.date < tomorrow_start
+            ),
+            select(
+                TimeEntry.hours,
+                case((TimeEntry.day == today, TimeEntry.hours), else_=0.0)
+            ).join(Timesheet, TimeEntry.timesheet_id == Timesheet.id).where(
+                Timesheet.user_id == current_user.id,
+                TimeEntry.day >= week_start,
+                TimeEntry.day <= today
+            )
+        ).cte("hours")
+
+        def hours_sum(column):
+            return select(func.coalesce(func.sum(column), 0.0)).scalar_subquery()
+
+        # Every count and hours total as a scalar subquery of one SELECT, so the
+        # headline numbers cost a single round-trip instead of ten
+        totals = db.execute(select(
+            task_count(*task_filters, *window_filters).label("my_tasks"),
+            # Tasks due today (always today regardless of filter, for contextual info)
+            task_count(
+                Task.assignee_id == current_user.id,
+                Task.due_date >= today_start,
+                Task.due_date < tomorrow_start,
+                Task.status != TaskStatus.COMPLETED.value
+            ).label("today_tasks"),
+            # Due tasks (non-completed, non-overdue, non-cancelled)
+            task_count(
+                *task_filters,
+                Task.status != TaskStatus.COMPLETED.value,
+                Task.status != TaskStatus.OVERDUE.value,
+                Task.status != TaskStatus.CANCELLED.value,
+                *window_filters
+            ).label("due_tasks"),
+            task_count(
+                *task_filters, Task.status == TaskStatus.OVERDUE.value, *window_filters
+            ).label("overdue_tasks"),
+            task_count(
+                *task_filters, Task.status == TaskStatus.COMPLETED.value, *completed_window_filters
+            ).label("completed_tasks"),
+            # Completed today (for time status section, always "today")
+            task_count(
+                Task.assignee_id == current_user.id,
+                Task.status == TaskStatus.COMPLETED.value,
+                Task.completed_at >= today_start,
+                Task.completed_at < tomorrow_start
+            ).label("completed_today"),
+            hours_sum(hours.c.today_hours).label("hours_today"),
+            hours_sum(hours.c.hours).label("hours_week"),
+        )).one()
+
+        my_tasks_count = totals.my_tasks
+        today_tasks_count = totals.today_tasks
+        due_tasks_count = totals.due_tasks
+        overdue_tasks_count = totals.overdue_tasks
+        completed_tasks_count = totals.completed_tasks
+        completed_today_count = totals.completed_today
+        hours_logged_today = float(totals.hours_today)
+        hours_logged_this_week = float(totals.hours_week)
 
         # Upcoming deadlines (next 5 tasks due — show within 30 days by default)
         try:
-            from sqlalchemy.orm import joinedload as _jl
-            deadline_q = db.query(Task).options(_jl(Task.project)).filter(
+            # Only the columns the cards show, as plain rows rather than
+            # Task/Project entities in the identity map
+            deadline_filters = [
                 Task.assignee_id == current_user.id,
                 Task.status != TaskStatus.COMPLETED.value,
-                Task.status != TaskStatus.CANCELLED.value if hasattr(TaskStatus, 'CANCELLED') else True,
+                Task.status != TaskStatus.CANCELLED.value,
                 Task.due_date != None,
-            )
+            ]
             if filter_start and filter_end:
-                deadline_q = deadline_q.filter(
-                    Task.due_date >= filter_start,
-                    Task.due_date <= filter_end
-                )
+                deadline_filters += [Task.due_date >= filter_start, Task.due_date <= filter_end]
             else:
                 # Widen window to 30 days to show more upcoming items
                 look_back = now - timedelta(days=1)  # include today's tasks
-                deadline_q = deadline_q.filter(
-                    Task.due_date >= look_back,
-                    Task.due_date <= now + timedelta(days=30)
-                )
-            upcoming_tasks = deadline_q.order_by(Task.due_date.asc()).limit(10).all()
+                deadline_filters += [Task.due_date >= look_back, Task.due_date <= now + timedelta(days=30)]
+            deadline_q = select(
+                Task.id, Task.name, Task.due_date, Task.priority, Project.name.label("project_name")
+            ).outerjoin(Project, Task.project_id == Project.id).where(
+                *deadline_filters
+            ).order_by(Task.due_date.asc()).limit(10)
 
             upcoming_deadlines = [
                 UpcomingDeadline(
-                    task_id=str(t.id),
-                    task_name=t.name,
-                    due_date=t.due_date.isoformat() if t.due_date else "",
-                    priority=t.priority or "medium",
-                    project_name=t.project.name if t.project else None
+                    task_id=str(row.id),
+                    task_name=row.name,
+                    due_date=row.due_date.isoformat() if row.due_date else "",
+                    priority=row.priority or "medium",
+                    project_name=row.project_name
                 )
-                for t in upcoming_tasks
+                for row in db.execute(deadline_q)
             ]
         except Exception as deadline_err:
             import logging
             logging.warning(f"Upcoming deadlines error: {deadline_err}")
             upcoming_deadlines = []
 
-        # Hours logged today
-        try:
-            hours_logged_today = db.query(func.sum(TimeLog.hours)).filter(
-                TimeLog.user_id == current_user.id,
-                func.date(TimeLog.date) == today
-            ).scalar() or 0.0
-
-            timeentry_today = db.query(func.sum(TimeEntry.hours)).join(Timesheet).filter(
-                Timesheet.user_id == current_user.id,
-                TimeEntry.day == today
-            ).scalar() or 0.0
-
-            hours_logged_today = float(hours_logged_today) + float(timeentry_today)
-        except Exception:
-            hours_logged_today = 0.0
-
-        # Hours logged this week
-        try:
-            hours_logged_this_week = db.query(func.sum(TimeLog.hours)).filter(
-                TimeLog.user_id == current_user.id,
-                func.date(TimeLog.date) >= week_start,
-                func.date(TimeLog.date) <= today
-            ).scalar() or 0.0
-
-            timeentry_week = db.query(func.sum(TimeEntry.hours)).join(Timesheet).filter(
-                Timesheet.user_id == current_user.id,
-                TimeEntry.day >= week_start,
-                TimeEntry.day <= today
-            ).scalar() or 0.0
-
-            hours_logged_this_week = float(hours_logged_this_week) + float(timeentry_week)
-        except Exception:
-            hours_logged_this_week = 0.0
-
         # Tasks by status
         try:
             status_q = db.query(Task.status, func.count(Task.id)).filter(
@@ -277,51 +316,40 @@ def get_personal_dashboard(
         except Exception:
             tasks_by_status = {"todo": 0, "in_progress": 0, "review": 0, "completed": 0, "blocked": 0}
 
-        # Recent activity
+        # Recent activity: the latest completions and creations merged and
+        # ordered by the database, so only the 5 rows shown are fetched
         try:
-            completed_q2 = db.query(Task).filter(
-                Task.assignee_id == current_user.id,
-                Task.completed_at != None
-            )
-            created_q2 = db.query(Task).filter(
-                Task.assignee_id == current_user.id
-            )
+            completed_filters = [Task.assignee_id == current_user.id, Task.completed_at != None]
+            created_filters = [Task.assignee_id == current_user.id]
             if filter_start and filter_end:
-                completed_q2 = completed_q2.filter(
-                    Task.completed_at >= filter_start,
-                    Task.completed_at <= filter_end
-                )
-                created_q2 = created_q2.filter(
-                    Task.created_at >= filter_start,
-                    Task.created_at <= filter_end
+                completed_filters += [Task.completed_at >= filter_start, Task.completed_at <= filter_end]
+                created_filters += [Task.created_at >= filter_start, Task.created_at <= filter_end]
+
+            activity_q = union_all(
+                select(
+                    Task.id, Task.name, literal("task_completed").label("type"),
+                    Task.completed_at.label("ts")
+                ).where(*completed_filters),
+                select(
+                    Task.id, Task.name, literal("task_created").label("type"),
+                    func.coalesce(Task.created_at, now).label("ts")
+                ).where(*created_filters)
+            )
+            activity_q = activity_q.order_by(desc(activity_q.selected_columns.ts)).limit(5)
+
+            recent_activity = [
+                RecentActivity(
+                    id=str(row.id) if row.type == "task_completed" else f"created_{row.id}",
+                    type=row.type,
+                    message=f"{'Completed' if row.type == 'task_completed' else 'Created'} '{row.name}'",
+                    timestamp=row.ts.isoformat()
                 )
-
-            recent_completed = completed_q2.order_by(Task.completed_at.desc()).limit(5).all()
-            recent_created = created_q2.order_by(Task.created_at.desc()).limit(5).all()
-
-            activities = []
-            for task in recent_completed:
-                activities.append(RecentActivity(
-                    id=str(task.id),
-                    type="task_completed",
-                    message=f"Completed '{task.name}'",
-                    timestamp=task.completed_at.isoformat() if task.completed_at else now.isoformat()
-                ))
-
-            for task in recent_created:
-                activities.append(RecentActivity(
-                    id=f"created_{task.id}",
-                    type="task_created",
-                    message=f"Created '{task.name}'",
-                    timestamp=task.created_at.isoformat() if task.created_at else now.isoformat()
-                ))
-
-            activities.sort(key=lambda x: x.timestamp, reverse=True)
-            recent_activity = activities[:5]
+                for row in db.execute(activity_q)
+            ]
         except Exception:
             recent_activity = []
 
-        return PersonalDashboardResponse(
+        response = PersonalDashboardResponse(
             my_tasks_count=my_tasks_count,
             today_tasks_count=today_tasks_count,
             due_tasks_count=due_tasks_count,
@@ -334,6 +362,9 @@ def get_personal_dashboard(
             tasks_by_status=tasks_by_status,
             recent_activity=recent_activity
         )
+        serialized = _serialize(response)
+        dashboard_cache.set(cache_key, serialized)
+        return _json_response(request, serialized)
     except Exception as e:
         import logging
         logging.error(f"Personal dashboard error: {e}", exc_info=True)
@@ -352,20 +383,26 @@ def get_personal_dashboard(
         )
 @router.get("/today", response_model=TodayStatsResponse)
 def get_today_stats(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get today's quick stats."""
     today = datetime.utcnow().date()
+    cache_key = ("today", current_user.id, today)
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached)
+
     now = datetime.utcnow()
-    today_start = datetime.combine(today, datetime.min.time())
-    today_end = datetime.combine(today, datetime.max.time())
+    today_start = _day_start(today)
+    tomorrow_start = today_start + timedelta(days=1)
     
     # Tasks due today
     tasks_due_today = db.query(Task).filter(
         Task.assignee_id == current_user.id,
         Task.due_date >= today_start,
-        Task.due_date <= today_end,
+        Task.due_date < tomorrow_start,
         Task.status != TaskStatus.COMPLETED.value
     ).count()
     
@@ -373,51 +410,64 @@ def get_today_stats(
     tasks_completed_today = db.query(Task).filter(
         Task.assignee_id == current_user.id,
         Task.status == TaskStatus.COMPLETED.value,
-        func.date(Task.completed_at) == today
+        Task.completed_at >= today_start,
+        Task.completed_at < tomorrow_start
     ).count()
     
     # Hours logged today
     hours_logged = db.query(func.sum(TimeLog.hours)).filter(
         TimeLog.user_id == current_user.id,
-        func.date(TimeLog.date) == today
+        TimeLog.date >= today_start,
+        TimeLog.date < tomorrow_start
     ).scalar() or 0.0
     
-    return TodayStatsResponse(
+    response = TodayStatsResponse(
         tasks_due_today=tasks_due_today,
         tasks_completed_today=tasks_completed_today,
         hours_logged_today=round(float(hours_logged), 1),
         meetings_today=0,  # TODO: Implement when calendar is integrated
         unread_notifications=0  # TODO: Get from notifications table
     )
+    serialized = _serialize(response)
+    dashboard_cache.set(cache_key, serialized)
+    return _json_response(request, serialized)
 
 
 @router.get("/weekly-summary", response_model=WeeklySummaryResponse)
 def get_weekly_summary(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get weekly summary stats."""
     today = datetime.utcnow().date()
+    cache_key = ("weekly-summary", current_user.id, today)
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(request, cached)
+
     week_start = today - timedelta(days=today.weekday())
     last_week_start = week_start - timedelta(days=7)
+    week_start_dt = _day_start(week_start)
+    last_week_start_dt = _day_start(last_week_start)
     
     # Tasks completed this week
     tasks_completed = db.query(Task).filter(
         Task.assignee_id == current_user.id,
         Task.status == TaskStatus.COMPLETED.value,
-        func.date(Task.completed_at) >= week_start
+        Task.completed_at >= week_start_dt
     ).count()
     
     # Tasks created this week
     tasks_created = db.query(Task).filter(
         Task.assignee_id == current_user.id,
-        func.date(Task.created_at) >= week_start
+        Task.created_at >= week_start_dt
     ).count()
     
     # Hours logged this week
     hours_logged = db.query(func.sum(TimeLog.hours)).filter(
         TimeLog.user_id == current_user.id,
-        func.date(TimeLog.date) >= week_start
+        TimeLog.date >= week_start_dt
     ).scalar() or 0.0
     
     # Calculate productivity score (tasks completed / expected * 100)
@@ -428,8 +478,8 @@ def get_weekly_summary(
     last_week_completed = db.query(Task).filter(
         Task.assignee_id == current_user.id,
         Task.status == TaskStatus.COMPLETED.value,
-        func.date(Task.completed_at) >= last_week_start,
-        func.date(Task.completed_at) < week_start
+        Task.completed_at >= last_week_start_dt,
+        Task.completed_at < week_start_dt
     ).count()
     
     if tasks_completed > last_week_completed:
@@ -439,7 +489,7 @@ def get_weekly_summary(
     else:
         productivity_trend = "stable"
     
-    return WeeklySummaryResponse(
+    response = WeeklySummaryResponse(
         week_starting=week_start.isoformat(),
         tasks_completed=tasks_completed,
         tasks_created=tasks_created,
@@ -447,10 +497,22 @@ def get_weekly_summary(
         productivity_score=round(productivity_score, 1),
         productivity_trend=productivity_trend
     )
+    serialized = _serialize(response)
+    dashboard_cache.set(cache_key, serialized)
+    return _json_response(request, serialized)
 
 
 # =============== Charts Data ===============
 
+def _by_day(rows) -> dict:
+    """Map ``(day, value)`` rows from a ``GROUP BY func.date(...)`` query by ISO date.
+
+    func.date() comes back as a string on SQLite and a date on PostgreSQL;
+    str() gives the same YYYY-MM-DD key for both.
+    """
+    return {str(day): value for day, value in rows}
+
+
 @router.get("/charts/task-completion")
 def get_task_completion_trends(
     days: int = 7,
@@ -461,24 +523,33 @@ def get_task_completion_trends(
     today = datetime.utcnow().date()
     start_date = today - timedelta(days=days-1)
     
-    result = []
-    for i in range(days):
-        day_date = start_date + timedelta(days=i)
-        
-        created = db.query(Task).filter(
+    range_start = _day_start(start_date)
+    range_end = _day_start(today + timedelta(days=1))
+    created_day = func.date(Task.created_at)
+    completed_day = func.date(Task.completed_at)
+    # One grouped query per series; days without tasks are filled with zeros below
+    created_by_day = _by_day(
+        db.query(created_day, func.count(Task.id)).filter(
             Task.assignee_id == current_user.id,
-            func.date(Task.created_at) == day_date
-        ).count()
-        
-        completed = db.query(Task).filter(
+            Task.created_at >= range_start,
+            Task.created_at < range_end
+        ).group_by(created_day).all()
+    )
+    completed_by_day = _by_day(
+        db.query(completed_day, func.count(Task.id)).filter(
             Task.assignee_id == current_user.id,
-            func.date(Task.completed_at) == day_date
-        ).count()
-        
+            Task.completed_at >= range_start,
+            Task.completed_at < range_end
+        ).group_by(completed_day).all()
+    )
+    
+    result = []
+    for i in range(days):
+        day = (start_date + timedelta(days=i)).isoformat()
         result.append({
-            "date": day_date.isoformat(),
-            "created": created,
-            "completed": completed
+            "date": day,
+            "created": created_by_day.get(day, 0),
+            "completed": completed_by_day.get(day, 0)
         })
     
     return result
@@ -494,18 +565,21 @@ def get_time_logged_trends(
     today = datetime.utcnow().date()
     start_date = today - timedelta(days=days-1)
     
+    log_day = func.date(TimeLog.date)
+    hours_by_day = _by_day(
+        db.query(log_day, func.sum(TimeLog.hours)).filter(
+            TimeLog.user_id == current_user.id,
+            TimeLog.date >= _day_start(start_date),
+            TimeLog.date < _day_start(today + timedelta(days=1))
+        ).group_by(log_day).all()
+    )
+    
     result = []
     for i in range(days):
-        day_date = start_date + timedelta(days=i)
-        
-        hours = db.query(func.sum(TimeLog.hours)).filter(
-            TimeLog.user_id == current_user.id,
-            func.date(TimeLog.date) == day_date
-        ).scalar() or 0.0
-        
+        day = (start_date + timedelta(days=i)).isoformat()
         result.append({
-            "date": day_date.isoformat(),
-            "hours": round(float(hours), 1)
+            "date": day,
+            "hours": round(float(hours_by_day.get(day) or 0.0), 1)
         })
     
     return result
@@ -559,7 +633,8 @@ def get_dashboard_stats(
     completed_today = db.query(Task).filter(
         Task.assignee_id == current_user.id,
         Task.status == TaskStatus.COMPLETED.value,
-        func.date(Task.completed_at) == today
+        Task.completed_at >= _day_start(today),
+        Task.completed_at < _day_start(today + timedelta(days=1))
     ).count()
     
     overdue_tasks = db.query(Task).filter(
@@ -571,7 +646,7 @@ def get_dashboard_stats(
     # Calculate total hours this week
     total_hours_this_week = db.query(func.sum(TimeLog.hours)).filter(
         TimeLog.user_id == current_user.id,
-        func.date(TimeLog.date) >= week_start
+        TimeLog.date >= _day_start(week_start)
     ).scalar() or 0.0
     
     return {
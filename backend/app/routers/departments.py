@@ -1,7 +1,8 @@
-from typing import List
+from typing import Dict, List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, selectinload
 from app.database import get_db
 from app.models import Department, DepartmentManager, User
 from app.models.project import Project
@@ -12,27 +13,42 @@ from app.schemas import (
 )
 from app.utils import get_current_active_user
 from app.utils.role_guards import is_admin, is_manager
+from app.utils.pagination import paginate_by_name
 from app.utils.tenant import scope_to_org, set_org_id
 
 router = APIRouter()
 
 
-def build_department_response(dept: Department, db: Session) -> dict:
-    """Build department response with managers and member count."""
-    managers = []
-    for dm in dept.department_managers:
-        user = db.query(User).filter(User.id == dm.user_id).first()
-        managers.append(DepartmentManagerResponse(
+# Managers and their users in two batched SELECTs instead of one per manager
+DEPARTMENT_MANAGERS_LOAD = selectinload(Department.department_managers).joinedload(DepartmentManager.user)
+
+
+def build_department_response(
+    dept: Department,
+    db: Session,
+    member_count: Optional[int] = None,
+    team_count: Optional[int] = None
+) -> dict:
+    """Build department response with managers and member count.
+    
+    Counts are queried here unless the caller already has them (list endpoint).
+    """
+    managers = [
+        DepartmentManagerResponse(
             id=dm.id,
             employee_id=dm.user_id,
-            employee_name=user.full_name if user else None,
+            employee_name=dm.user.full_name if dm.user else None,
             is_primary=dm.is_primary,
             start_date=dm.start_date,
             end_date=dm.end_date
-        ))
+        )
+        for dm in dept.department_managers
+    ]
     
-    member_count = db.query(User).filter(User.department_id == dept.id).count()
-    team_count = db.query(Team).filter(Team.department_id == dept.id, Team.is_active == True).count()
+    if member_count is None:
+        member_count = db.query(User).filter(User.department_id == dept.id).count()
+    if team_count is None:
+        team_count = db.query(Team).filter(Team.department_id == dept.id, Team.is_active == True).count()
 
     return {
         "id": dept.id,
@@ -46,22 +62,74 @@ def build_department_response(dept: Department, db: Session) -> dict:
     }
 
 
+def add_department_managers(db: Session, dept_id: str, managers) -> None:
+    """Insert manager rows for a department, skipping unknown employees.
+
+    Checks every employee in one SELECT and inserts all rows in one executemany.
+    """
+    if not managers:
+        return
+    existing_ids = set(db.scalars(
+        select(User.id).where(User.id.in_({mgr.employee_id for mgr in managers}))
+    ))
+    rows = [
+        {
+            "department_id": dept_id,
+            "user_id": mgr.employee_id,
+            "is_primary": mgr.is_primary,
+            "start_date": mgr.start_date or date.today(),
+            "end_date": mgr.end_date
+        }
+        for mgr in managers
+        if mgr.employee_id in existing_ids
+    ]
+    if rows:
+        db.execute(insert(DepartmentManager), rows)
+
+
 @router.get("/", response_model=List[DepartmentResponse])
 def get_all_departments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     search: str = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all departments."""
+    """Get all departments, ordered by name (``cursor`` pages via ``X-Next-Cursor``)."""
     query = db.query(Department)
     # Tenant isolation
     query = scope_to_org(query, Department, current_user)
     if search:
         query = query.filter(Department.name.ilike(f"%{search}%"))
-    departments = query.offset(skip).limit(limit).all()
-    return [build_department_response(dept, db) for dept in departments]
+    departments = paginate_by_name(
+        query.options(DEPARTMENT_MANAGERS_LOAD), Department, response, limit, skip, cursor
+    )
+    
+    # Member and active team counts for the whole page, grouped by department
+    dept_ids = [dept.id for dept in departments]
+    member_counts: Dict[str, int] = dict(
+        db.query(User.department_id, func.count(User.id))
+        .filter(User.department_id.in_(dept_ids))
+        .group_by(User.department_id)
+        .all()
+    ) if dept_ids else {}
+    team_counts: Dict[str, int] = dict(
+        db.query(Team.department_id, func.count(Team.id))
+        .filter(Team.department_id.in_(dept_ids), Team.is_active == True)
+        .group_by(Team.department_id)
+        .all()
+    ) if dept_ids else {}
+    
+    return [
+        build_department_response(
+            dept, db,
+            member_count=member_counts.get(dept.id, 0),
+            team_count=team_counts.get(dept.id, 0)
+        )
+        for dept in departments
+    ]
 
 
 @router.post("/", response_model=DepartmentResponse, status_code=status.HTTP_201_CREATED)
@@ -84,25 +152,13 @@ def create_department(
     db.flush()  # Get the ID before adding managers
     
     # Add managers if provided
-    if dept_data.managers:
-        for mgr in dept_data.managers:
-            # Verify user exists
-            user = db.query(User).filter(User.id == mgr.employee_id).first()
-            if not user:
-                continue
-            
-            dept_manager = DepartmentManager(
-                department_id=db_dept.id,
-                user_id=mgr.employee_id,
-                is_primary=mgr.is_primary,
-                start_date=mgr.start_date or date.today(),
-                end_date=mgr.end_date
-            )
-            db.add(dept_manager)
+    add_department_managers(db, db_dept.id, dept_data.managers)
     
+    # Built inside the transaction, where the department is still loaded and
+    # the managers are read once, instead of refreshing after commit
+    response = build_department_response(db_dept, db)
     db.commit()
-    db.refresh(db_dept)
-    return build_department_response(db_dept, db)
+    return response
 
 
 @router.get("/{dept_id}", response_model=DepartmentResponse)
@@ -112,7 +168,7 @@ def get_department(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific department by ID."""
-    dept = db.query(Department).filter(Department.id == dept_id).first()
+    dept = db.query(Department).options(DEPARTMENT_MANAGERS_LOAD).filter(Department.id == dept_id).first()
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
     return build_department_response(dept, db)
@@ -147,23 +203,11 @@ def update_department(
         ).delete()
         
         # Add new managers
-        for mgr in dept_data.managers:
-            user = db.query(User).filter(User.id == mgr.employee_id).first()
-            if not user:
-                continue
-            
-            dept_manager = DepartmentManager(
-                department_id=dept_id,
-                user_id=mgr.employee_id,
-                is_primary=mgr.is_primary,
-                start_date=mgr.start_date or date.today(),
-                end_date=mgr.end_date
-            )
-            db.add(dept_manager)
+        add_department_managers(db, dept_id, dept_data.managers)
     
+    response = build_department_response(dept, db)
     db.commit()
-    db.refresh(dept)
-    return build_department_response(dept, db)
+    return response
 
 
 @router.delete("/{dept_id}", status_code=status.HTTP_204_NO_CONTENT)
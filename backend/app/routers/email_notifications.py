@@ -1,18 +1,31 @@
 """Email Notifications API router."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from pydantic import BaseModel
+from sqlalchemy import desc, insert, select, tuple_
+from pydantic import BaseModel, TypeAdapter
+import logging
 import uuid
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
+from app.config import get_settings
 from app.models import User, EmailPreference, EmailLog, TaskReminder
+from app.services.dashboard_cache import DashboardCache, invalidate_on_commit
 from app.utils import get_current_active_user
+from app.utils.error_handlers import ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Per-user preference rows, read by every settings screen and rarely written.
+# Entries are keyed ("email_preferences", user_id) and replaced on every PUT here;
+# writes from anywhere else (e.g. GDPR consent or erasure) drop them on commit.
+email_preferences_cache = DashboardCache(ttl_seconds=get_settings().email_preferences_cache_ttl)
+invalidate_on_commit(email_preferences_cache, {EmailPreference: "user_id"})
+
 # =============== Schemas ===============
 
 class EmailPreferencesResponse(BaseModel):
@@ -160,6 +173,95 @@ def get_or_create_preferences(db: Session, user_id: str) -> EmailPreference:
         db.refresh(prefs)
     return prefs
 
+
+def _cache_preferences(prefs: EmailPreference) -> Dict[str, Any]:
+    """Store a plain copy of a preference row in the cache and return it."""
+    snapshot = {
+        column.key: getattr(prefs, column.key)
+        for column in EmailPreference.__table__.columns
+    }
+    snapshot["reminder_days_before"] = list(snapshot["reminder_days_before"] or [])
+    email_preferences_cache.set(("email_preferences", prefs.user_id), snapshot)
+    return snapshot
+
+
+def get_cached_preferences(db: Session, user_id: str) -> Dict[str, Any]:
+    """Preference values for a user, from the cache when possible."""
+    snapshot = email_preferences_cache.get(("email_preferences", user_id))
+    if snapshot is None:
+        snapshot = _cache_preferences(get_or_create_preferences(db, user_id))
+    return snapshot
+
+
+def write_email_logs(rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert EmailLog rows in one executemany INSERT.
+
+    Runs as a background task after the response is sent, so it opens its
+    own session instead of using the request's.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(insert(EmailLog), rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to write {len(rows)} email log(s): {e}")
+    finally:
+        db.close()
+
+
+# EmailPreference column behind each field of the reminder and digest payloads
+REMINDER_SETTING_COLUMNS = {
+    "enabled": "reminder_enabled",
+    "days_before_due": "reminder_days_before",
+    "time": "reminder_time",
+    "timezone": "reminder_timezone",
+}
+
+DIGEST_SETTING_COLUMNS = {
+    "enabled": "digest_enabled",
+    "frequency": "digest_frequency",
+    "day_of_week": "digest_day_of_week",
+    "day_of_month": "digest_day_of_month",
+    "time": "digest_time",
+    "timezone": "reminder_timezone",
+    "include_overdue": "digest_include_overdue",
+    "include_upcoming": "digest_include_upcoming",
+    "include_completed": "digest_include_completed",
+}
+
+
+def _apply_settings(prefs: EmailPreference, data: BaseModel, columns: Dict[str, str]) -> None:
+    """Copy the fields the client sent (and didn't null) onto prefs."""
+    for field in data.model_fields_set:
+        value = getattr(data, field)
+        if value is not None:
+            setattr(prefs, columns[field], value)
+
+
+def _reminder_settings(prefs: Dict[str, Any]) -> dict:
+    return {
+        "enabled": prefs["reminder_enabled"],
+        "days_before_due": prefs["reminder_days_before"] or [1, 3],
+        "time": prefs["reminder_time"] or "09:00",
+        "timezone": prefs["reminder_timezone"] or "UTC",
+    }
+
+
+def _digest_settings(prefs: Dict[str, Any]) -> dict:
+    return {
+        "enabled": prefs["digest_enabled"],
+        "frequency": prefs["digest_frequency"] or "weekly",
+        "day_of_week": prefs["digest_day_of_week"],
+        "day_of_month": prefs["digest_day_of_month"],
+        "time": prefs["digest_time"] or "08:00",
+        "timezone": prefs["reminder_timezone"] or "UTC",
+        "include_overdue": prefs["digest_include_overdue"],
+        "include_upcoming": prefs["digest_include_upcoming"],
+        "include_completed": prefs["digest_include_completed"],
+    }
+
 # =============== Preferences Endpoints ===============
 
 @router.get("/preferences", response_model=EmailPreferencesResponse)
@@ -168,8 +270,7 @@ def get_email_preferences(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get email notification preferences."""
-    prefs = get_or_create_preferences(db, current_user.id)
-    return prefs
+    return get_cached_preferences(db, current_user.id)
 
 
 @router.put("/preferences", response_model=EmailPreferencesResponse)
@@ -181,14 +282,14 @@ def update_email_preferences(
     """Update email notification preferences."""
     prefs = get_or_create_preferences(db, current_user.id)
     
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(prefs, field, value)
+    for field in data.model_fields_set:
+        setattr(prefs, field, getattr(data, field))
     
     prefs.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(prefs)
     
-    return prefs
+    return _cache_preferences(prefs)
 
 
 # =============== Reminder Settings Endpoints ===============
@@ -199,13 +300,7 @@ def get_reminder_settings(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get task reminder settings."""
-    prefs = get_or_create_preferences(db, current_user.id)
-    return {
-        "enabled": prefs.reminder_enabled,
-        "days_before_due": prefs.reminder_days_before or [1, 3],
-        "time": prefs.reminder_time or "09:00",
-        "timezone": prefs.reminder_timezone or "UTC",
-    }
+    return _reminder_settings(get_cached_preferences(db, current_user.id))
 
 
 @router.put("/reminders", response_model=ReminderSettingsResponse)
@@ -217,25 +312,13 @@ def update_reminder_settings(
     """Update task reminder settings."""
     prefs = get_or_create_preferences(db, current_user.id)
     
-    if data.enabled is not None:
-        prefs.reminder_enabled = data.enabled
-    if data.days_before_due is not None:
-        prefs.reminder_days_before = data.days_before_due
-    if data.time is not None:
-        prefs.reminder_time = data.time
-    if data.timezone is not None:
-        prefs.reminder_timezone = data.timezone
+    _apply_settings(prefs, data, REMINDER_SETTING_COLUMNS)
     
     prefs.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(prefs)
     
-    return {
-        "enabled": prefs.reminder_enabled,
-        "days_before_due": prefs.reminder_days_before or [1, 3],
-        "time": prefs.reminder_time or "09:00",
-        "timezone": prefs.reminder_timezone or "UTC",
-    }
+    return _reminder_settings(_cache_preferences(prefs))
 
 
 # =============== Digest Settings Endpoints ===============
@@ -246,18 +329,7 @@ def get_digest_settings(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get digest email settings."""
-    prefs = get_or_create_preferences(db, current_user.id)
-    return {
-        "enabled": prefs.digest_enabled,
-        "frequency": prefs.digest_frequency or "weekly",
-        "day_of_week": prefs.digest_day_of_week,
-        "day_of_month": prefs.digest_day_of_month,
-        "time": prefs.digest_time or "08:00",
-        "timezone": prefs.reminder_timezone or "UTC",
-        "include_overdue": prefs.digest_include_overdue,
-        "include_upcoming": prefs.digest_include_upcoming,
-        "include_completed": prefs.digest_include_completed,
-    }
+    return _digest_settings(get_cached_preferences(db, current_user.id))
 
 
 @router.put("/digest", response_model=DigestSettingsResponse)
@@ -269,40 +341,13 @@ def update_digest_settings(
     """Update digest email settings."""
     prefs = get_or_create_preferences(db, current_user.id)
     
-    if data.enabled is not None:
-        prefs.digest_enabled = data.enabled
-    if data.frequency is not None:
-        prefs.digest_frequency = data.frequency
-    if data.day_of_week is not None:
-        prefs.digest_day_of_week = data.day_of_week
-    if data.day_of_month is not None:
-        prefs.digest_day_of_month = data.day_of_month
-    if data.time is not None:
-        prefs.digest_time = data.time
-    if data.timezone is not None:
-        prefs.reminder_timezone = data.timezone
-    if data.include_overdue is not None:
-        prefs.digest_include_overdue = data.include_overdue
-    if data.include_upcoming is not None:
-        prefs.digest_include_upcoming = data.include_upcoming
-    if data.include_completed is not None:
-        prefs.digest_include_completed = data.include_completed
+    _apply_settings(prefs, data, DIGEST_SETTING_COLUMNS)
     
     prefs.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(prefs)
     
-    return {
-        "enabled": prefs.digest_enabled,
-        "frequency": prefs.digest_frequency or "weekly",
-        "day_of_week": prefs.digest_day_of_week,
-        "day_of_month": prefs.digest_day_of_month,
-        "time": prefs.digest_time or "08:00",
-        "timezone": prefs.reminder_timezone or "UTC",
-        "include_overdue": prefs.digest_include_overdue,
-        "include_upcoming": prefs.digest_include_upcoming,
-        "include_completed": prefs.digest_include_completed,
-    }
+    return _digest_settings(_cache_preferences(prefs))
 
 
 # =============== Email Logs Endpoints ===============
@@ -311,136 +356,157 @@ def update_digest_settings(
 def get_email_logs(
     page: int = 1,
     limit: int = 20,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get email logs for current user."""
-    query = db.query(EmailLog).filter(EmailLog.user_id == current_user.id)
-    
-    total = query.count()
-    pages = (total + limit - 1) // limit
+    """
+    Get email logs for current user, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the following
+    page; ``page`` still works for callers that don't have one.
+    """
+    # Plain column rows: the response is just the log's columns, so there's no
+    # need to build (and identity-map) an ORM object per row
+    query = (
+        select(EmailLog.__table__)
+        .where(EmailLog.user_id == current_user.id)
+        .order_by(desc(EmailLog.created_at), desc(EmailLog.id))
+    )
+    if cursor:
+        created_at, log_id = decode_cursor(cursor)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except ValueError:
+            raise ValidationError("Invalid cursor", field="cursor")
+        query = query.where(tuple_(EmailLog.created_at, EmailLog.id) < (created_at, log_id))
+    elif page > 1:
+        query = query.offset((page - 1) * limit)
     
-    logs = query.order_by(desc(EmailLog.created_at)).offset((page - 1) * limit).limit(limit).all()
+    # One extra row tells us whether another page exists without a COUNT
+    logs = [dict(row) for row in db.execute(query.limit(limit + 1)).mappings()]
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = encode_cursor(logs[-1]["created_at"].isoformat(), logs[-1]["id"])
     
     return {
         "logs": logs,
-        "total": total,
-        "pages": pages,
+        "next_cursor": next_cursor,
         "page": page,
     }
 
 
 # =============== Test Email Endpoint ===============
 
-@router.post("/test")
+@router.post("/test", status_code=status.HTTP_202_ACCEPTED)
 def send_test_email(
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Send a test email to verify settings."""
+    """Queue a test email to verify settings."""
     # In production, this would queue an actual email
-    # For now, we'll simulate success
+    # For now, we'll simulate success and only log it
+    now = datetime.utcnow()
+    background_tasks.add_task(write_email_logs, [{
+        "id": str(uuid.uuid4()),
+        "user_id": current_user.id,
+        "recipient_email": current_user.email,
+        "recipient_name": current_user.full_name or current_user.email,
+        "subject": "Test Email from LightIDEA",
+        "status": "sent",
+        "sent_at": now,
+        "created_at": now,
+    }])
     
-    # Log the test email
-    log = EmailLog(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        recipient_email=current_user.email,
-        recipient_name=current_user.full_name or current_user.email,
-        subject="Test Email from LightIDEA",
-        status="sent",
-        sent_at=datetime.utcnow(),
-        created_at=datetime.utcnow()
-    )
-    db.add(log)
-    db.commit()
-    
-    return {"success": True, "message": "Test email sent successfully"}
+    return {"success": True, "queued": True, "message": "Test email sent successfully"}
 
 
 # =============== Send Email Endpoint (Admin) ===============
 
-@router.post("/send")
+@router.post("/send", status_code=status.HTTP_202_ACCEPTED)
 def send_email(
     data: SendEmailRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Send a custom email (admin only)."""
+    """Queue a custom email (admin only)."""
     # Check admin permission
     if current_user.role not in ["admin", "super_admin"]:
         raise HTTPException(status_code=403, detail="Admin access required")
     
     email_id = str(uuid.uuid4())
     
-    # Log the email
-    for recipient in data.to:
-        log = EmailLog(
-            id=str(uuid.uuid4()),
-            user_id=current_user.id,
-            recipient_email=recipient,
-            recipient_name=recipient,
-            subject=data.subject,
-            template_id=data.template_id,
-            status="pending" if data.scheduled_for else "sent",
-            sent_at=data.scheduled_for or datetime.utcnow(),
-            created_at=datetime.utcnow()
-        )
-        db.add(log)
-    
-    db.commit()
+    # One log row per recipient, written after the response has gone out
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": current_user.id,
+            "recipient_email": recipient,
+            "recipient_name": recipient,
+            "subject": data.subject,
+            "template_id": data.template_id,
+            "status": "pending" if data.scheduled_for else "sent",
+            "sent_at": data.scheduled_for or now,
+            "created_at": now,
+        }
+        for recipient in data.to
+    ]
+    if rows:
+        background_tasks.add_task(write_email_logs, rows)
     
-    return {"success": True, "email_id": email_id}
+    return {"success": True, "queued": True, "email_id": email_id}
 
 
 # =============== Templates Endpoint ===============
 
+# Built-in templates; there is no template table yet, so these are served as-is
+_EMAIL_TEMPLATE_CREATED_AT = datetime.utcnow()
+
+_EMAIL_TEMPLATES = [
+    EmailTemplateResponse(
+        id="task-assigned",
+        name="Task Assignment",
+        subject="You've been assigned a new task: {{task_name}}",
+        body_html="<h1>New Task Assigned</h1><p>You have been assigned: {{task_name}}</p>",
+        body_text="New Task Assigned\nYou have been assigned: {{task_name}}",
+        variables=["task_name", "task_url", "assignee_name", "due_date"],
+        is_active=True,
+        created_at=_EMAIL_TEMPLATE_CREATED_AT,
+    ),
+    EmailTemplateResponse(
+        id="task-reminder",
+        name="Task Due Reminder",
+        subject="Reminder: {{task_name}} is due {{due_in}}",
+        body_html="<h1>Task Due Reminder</h1><p>{{task_name}} is due {{due_in}}</p>",
+        body_text="Task Due Reminder\n{{task_name}} is due {{due_in}}",
+        variables=["task_name", "task_url", "due_in", "due_date"],
+        is_active=True,
+        created_at=_EMAIL_TEMPLATE_CREATED_AT,
+    ),
+    EmailTemplateResponse(
+        id="weekly-digest",
+        name="Weekly Digest",
+        subject="Your Weekly Summary - {{week_start}} to {{week_end}}",
+        body_html="<h1>Weekly Summary</h1><p>Tasks completed: {{completed}}</p>",
+        body_text="Weekly Summary\nTasks completed: {{completed}}",
+        variables=["week_start", "week_end", "completed", "overdue", "upcoming"],
+        is_active=True,
+        created_at=_EMAIL_TEMPLATE_CREATED_AT,
+    ),
+]
+
+# Serialized once; the endpoint hands back the same bytes on every call
+_EMAIL_TEMPLATES_JSON = TypeAdapter(List[EmailTemplateResponse]).dump_json(_EMAIL_TEMPLATES)
+
+
 @router.get("/templates", response_model=List[EmailTemplateResponse])
 def get_email_templates(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get available email templates."""
-    # Return hardcoded templates for now
-    # In production, these would come from database
-    templates = [
-        {
-            "id": "task-assigned",
-            "name": "Task Assignment",
-            "subject": "You've been assigned a new task: {{task_name}}",
-            "body_html": "<h1>New Task Assigned</h1><p>You have been assigned: {{task_name}}</p>",
-            "body_text": "New Task Assigned\nYou have been assigned: {{task_name}}",
-            "variables": ["task_name", "task_url", "assignee_name", "due_date"],
-            "is_active": True,
-            "created_at": datetime.utcnow(),
-            "updated_at": None,
-        },
-        {
-            "id": "task-reminder",
-            "name": "Task Due Reminder",
-            "subject": "Reminder: {{task_name}} is due {{due_in}}",
-            "body_html": "<h1>Task Due Reminder</h1><p>{{task_name}} is due {{due_in}}</p>",
-            "body_text": "Task Due Reminder\n{{task_name}} is due {{due_in}}",
-            "variables": ["task_name", "task_url", "due_in", "due_date"],
-            "is_active": True,
-            "created_at": datetime.utcnow(),
-            "updated_at": None,
-        },
-        {
-            "id": "weekly-digest",
-            "name": "Weekly Digest",
-            "subject": "Your Weekly Summary - {{week_start}} to {{week_end}}",
-            "body_html": "<h1>Weekly Summary</h1><p>Tasks completed: {{completed}}</p>",
-            "body_text": "Weekly Summary\nTasks completed: {{completed}}",
-            "variables": ["week_start", "week_end", "completed", "overdue", "upcoming"],
-            "is_active": True,
-            "created_at": datetime.utcnow(),
-            "updated_at": None,
-        },
-    ]
-    return templates
+    return Response(content=_EMAIL_TEMPLATES_JSON, media_type="application/json")
 
 
 # =============== Unsubscribe Endpoint ===============
@@ -1,7 +1,7 @@
 """Expense Dashboard Router - Analytics and KPIs for expenses."""
 from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
@@ -12,7 +12,8 @@ from app.schemas import (
 from app.utils import get_current_active_user
 from app.services.expense_analytics import (
     get_expense_stats, get_monthly_trends, get_expenses_by_category,
-    get_expenses_by_department, get_expenses_by_project, get_budget_comparison
+    get_expenses_by_department, get_expenses_by_project, get_budget_comparison,
+    expense_analytics_cache
 )
 
 router = APIRouter()
@@ -52,9 +53,16 @@ def get_expense_analytics(
 ):
     """Get comprehensive expense analytics."""
     # Determine scope based on role
-    user_id = None if current_user.role in ["admin", "manager"] else current_user.id
+    is_manager = current_user.role in ["admin", "manager"]
+    user_id = None if is_manager else current_user.id
     department_id = current_user.department_id if current_user.role == "manager" else None
     
+    # Keyed by scope rather than by caller, so admins share one entry per period
+    cache_key = ("expense_analytics", user_id, department_id, start_date, end_date, year)
+    cached = expense_analytics_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     stats_data = get_expense_stats(
         db, 
         user_id=user_id, 
@@ -81,7 +89,7 @@ def get_expense_analytics(
         db, 
         start_date=start_date, 
         end_date=end_date
-    ) if current_user.role in ["admin", "manager"] else []
+    ) if is_manager else []
     
     by_project_data = get_expenses_by_project(
         db, 
@@ -90,9 +98,9 @@ def get_expense_analytics(
         user_id=user_id
     )
     
-    budget_data = get_budget_comparison(db) if current_user.role in ["admin", "manager"] else []
+    budget_data = get_budget_comparison(db) if is_manager else []
     
-    return ExpenseAnalyticsResponse(
+    response = ExpenseAnalyticsResponse(
         stats=ExpenseStats(**stats_data),
         monthly_trends=[MonthlyTrend(**t) for t in monthly_trends_data],
         by_category=[CategoryBreakdown(**c) for c in by_category_data],
@@ -100,6 +108,9 @@ def get_expense_analytics(
         by_project=[ProjectBreakdown(**p) for p in by_project_data],
         budget_comparison=[BudgetComparison(**b) for b in budget_data]
     )
+    body = response.model_dump_json()
+    expense_analytics_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/monthly-trends")
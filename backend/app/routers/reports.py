@@ -8,24 +8,14 @@ from sqlalchemy import func, and_, case
 from pydantic import BaseModel
 from io import BytesIO, StringIO
 import json, csv
+from importlib.util import find_spec
 from app.database import get_db
 from app.models import User, Task, Project, Team, TaskStatus
 from app.utils import get_current_active_user
 
-try:
-    import openpyxl
-    _has_openpyxl = True
-except ImportError:
-    _has_openpyxl = False
-
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet
-    _has_reportlab = True
-except ImportError:
-    _has_reportlab = False
+# openpyxl/reportlab are heavy; the export endpoints import them when called
+_has_openpyxl = find_spec("openpyxl") is not None
+_has_reportlab = find_spec("reportlab") is not None
 
 router = APIRouter()
 
@@ -589,6 +579,7 @@ def export_report(
         # Excel via openpyxl
         if not _has_openpyxl:
             raise HTTPException(status_code=501, detail="openpyxl not installed; use CSV format")
+        import openpyxl
         wb = openpyxl.Workbook()
         ws = wb.active
         ws.title = report_type.replace("-", "_")
@@ -882,6 +873,11 @@ def export_report_pdf(
         headers = ["Note"]
         rows = [[f"PDF export for '{report_type}' — no template configured yet."]]
 
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
     buf = BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4)
     styles = getSampleStyleSheet()
@@ -1,43 +1,121 @@
 """AI-powered task management service using Gemini."""
 from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, update
 import json
 
-from app.models import Task, User, Project, Team, TimeEntry, Timesheet
+from app.models import Task, TaskDependency, User, Project, Team, TimeEntry, Timesheet
 from app.config import get_settings
 
+OPEN_TASK_STATUSES = ["todo", "in_progress", "backlog", "waiting", "blocked"]
+# Task columns the batch scoring paths read; list endpoints load only these
+PRIORITY_SCORE_COLUMNS = (Task.id, Task.name, Task.priority, Task.due_date, Task.project_id, Task.ai_priority_score)
+DEADLINE_RISK_COLUMNS = (Task.id, Task.name, Task.due_date, Task.estimated_hours, Task.actual_hours, Task.assignee_id)
+PRIORITY_WEIGHTS = {"urgent": 30, "high": 20, "medium": 0, "low": -10}
+PROJECT_PRIORITY_WEIGHTS = {"critical": 10, "high": 5, "medium": 0, "low": -5}
+
+
+def score_to_priority(score: float) -> str:
+    """Map a 0-100 priority score to a task priority label."""
+    if score >= 80:
+        return "urgent"
+    if score >= 60:
+        return "high"
+    if score >= 40:
+        return "medium"
+    return "low"
+
+
+@lru_cache(maxsize=1)
+def _get_genai_client():
+    """Create the Gemini client once per process if an API key is available."""
+    settings = get_settings()
+    if settings.gemini_api_key and len(settings.gemini_api_key) > 20:
+        try:
+            from google import genai
+            return genai.Client(api_key=settings.gemini_api_key)
+        except Exception as e:
+            print(f"Failed to init AI model: {e}")
+    return None
+
 
 class AITaskService:
     """AI-powered task management features."""
     
     def __init__(self, db: Session):
         self.db = db
-        self._client = None
-        self._init_model()
-
-    def _init_model(self):
-        """Initialize Gemini client if API key is available."""
-        settings = get_settings()
-        if settings.gemini_api_key and len(settings.gemini_api_key) > 20:
-            try:
-                from google import genai
-                self._client = genai.Client(api_key=settings.gemini_api_key)
-            except Exception as e:
-                print(f"Failed to init AI model: {e}")
+        self._client = _get_genai_client()
     
     def calculate_priority_score(self, task: Task) -> float:
         """Calculate AI priority score for a task (0-100)."""
+        # Dependencies - if blocking other tasks
+        blocking_count = len(task.successor_dependencies) if hasattr(task, 'successor_dependencies') else 0
+        project_priority = task.project.priority if task.project else None
+        return self._priority_score(task, blocking_count, project_priority, datetime.utcnow())
+    
+    def score_priorities_batch(self, tasks: List[Task]) -> List[float]:
+        """Calculate priority scores for many tasks with one query per related table."""
+        if not tasks:
+            return []
+        
+        task_ids = [t.id for t in tasks]
+        blocking_counts = dict(
+            self.db.query(TaskDependency.predecessor_id, func.count(TaskDependency.id))
+            .filter(TaskDependency.predecessor_id.in_(task_ids))
+            .group_by(TaskDependency.predecessor_id)
+            .all()
+        )
+        
+        project_ids = {t.project_id for t in tasks if t.project_id}
+        project_priorities = dict(
+            self.db.query(Project.id, Project.priority).filter(Project.id.in_(project_ids)).all()
+        ) if project_ids else {}
+        
+        now = datetime.utcnow()
+        return [
+            self._priority_score(t, blocking_counts.get(t.id, 0), project_priorities.get(t.project_id), now)
+            for t in tasks
+        ]
+    
+    def recompute_priority_scores(self, batch_size: int = 500) -> int:
+        """Recompute and persist ai_priority_score for all open tasks."""
+        updated = 0
+        last_id = None
+        while True:
+            query = self.db.query(Task).options(load_only(*PRIORITY_SCORE_COLUMNS)).filter(
+                Task.status.in_(OPEN_TASK_STATUSES)
+            )
+            if last_id is not None:
+                query = query.filter(Task.id > last_id)
+            tasks = query.order_by(Task.id).limit(batch_size).all()
+            if not tasks:
+                break
+            
+            scores = self.score_priorities_batch(tasks)
+            # ORM bulk UPDATE by primary key: one executemany per batch
+            self.db.execute(
+                update(Task),
+                [{"id": t.id, "ai_priority_score": score} for t, score in zip(tasks, scores)]
+            )
+            self.db.commit()
+            updated += len(tasks)
+            last_id = tasks[-1].id
+        return updated
+    
+    @staticmethod
+    def _priority_score(task: Task, blocking_count: int, project_priority: Optional[str], now: datetime) -> float:
+        """Priority score formula shared by the single-task and batch paths."""
         score = 50.0  # Base score
         
         # Priority weight
-        priority_weights = {"urgent": 30, "high": 20, "medium": 0, "low": -10}
-        score += priority_weights.get(task.priority, 0)
+        score += PRIORITY_WEIGHTS.get(task.priority, 0)
         
         # Due date urgency
         if task.due_date:
-            days_until_due = (task.due_date - datetime.utcnow()).days
+            days_until_due = (task.due_date - now).days
             if days_until_due < 0:  # Overdue
                 score += 25
             elif days_until_due <= 1:
@@ -48,25 +126,89 @@ class AITaskService:
                 score += 5
         
         # Dependencies - if blocking other tasks
-        blocking_count = len(task.successor_dependencies) if hasattr(task, 'successor_dependencies') else 0
         score += blocking_count * 5
         
         # Project priority
-        if task.project and task.project.priority:
-            project_weights = {"critical": 10, "high": 5, "medium": 0, "low": -5}
-            score += project_weights.get(task.project.priority, 0)
+        if project_priority:
+            score += PROJECT_PRIORITY_WEIGHTS.get(project_priority, 0)
         
         return min(100, max(0, score))
     
     def predict_deadline_risk(self, task: Task) -> Dict[str, Any]:
         """Predict risk of missing deadline."""
+        if not task.due_date:
+            return self._deadline_risk(task, 0, 0, datetime.utcnow())
+        
+        # Blocking dependencies
+        incomplete_blockers = 0
+        if hasattr(task, 'predecessor_dependencies'):
+            blocking = [d for d in task.predecessor_dependencies if d.is_blocking]
+            for dep in blocking:
+                pred = self.db.query(Task).filter(Task.id == dep.predecessor_id).first()
+                if pred and pred.status not in ["completed", "cancelled"]:
+                    incomplete_blockers += 1
+        
+        # Assignee workload
+        assignee_tasks = 0
+        if task.assignee_id:
+            assignee_tasks = self.db.query(Task).filter(
+                Task.assignee_id == task.assignee_id,
+                Task.status.in_(["todo", "in_progress"]),
+                Task.due_date <= task.due_date
+            ).count()
+        
+        return self._deadline_risk(task, incomplete_blockers, assignee_tasks, datetime.utcnow())
+    
+    def predict_deadline_risks_batch(self, tasks: List[Task]) -> List[Dict[str, Any]]:
+        """Predict deadline risk for many tasks with one query per related table."""
+        if not tasks:
+            return []
+        
+        task_ids = [t.id for t in tasks]
+        incomplete_blockers = dict(
+            self.db.query(TaskDependency.successor_id, func.count(TaskDependency.id))
+            .join(Task, Task.id == TaskDependency.predecessor_id)
+            .filter(
+                TaskDependency.successor_id.in_(task_ids),
+                TaskDependency.is_blocking == True,
+                Task.status.notin_(["completed", "cancelled"])
+            )
+            .group_by(TaskDependency.successor_id)
+            .all()
+        )
+        
+        # Open due dates per assignee, sorted, so "tasks due before this one" is a bisect
+        assignee_ids = {t.assignee_id for t in tasks if t.assignee_id and t.due_date}
+        assignee_due_dates: Dict[str, List[datetime]] = {}
+        if assignee_ids:
+            for assignee_id, due_date in self.db.query(Task.assignee_id, Task.due_date).filter(
+                Task.assignee_id.in_(assignee_ids),
+                Task.status.in_(["todo", "in_progress"]),
+                Task.due_date != None
+            ):
+                assignee_due_dates.setdefault(assignee_id, []).append(due_date)
+            for due_dates in assignee_due_dates.values():
+                due_dates.sort()
+        
+        now = datetime.utcnow()
+        results = []
+        for t in tasks:
+            assignee_tasks = 0
+            if t.assignee_id and t.due_date:
+                assignee_tasks = bisect_right(assignee_due_dates.get(t.assignee_id, []), t.due_date)
+            results.append(self._deadline_risk(t, incomplete_blockers.get(t.id, 0), assignee_tasks, now))
+        return results
+    
+    @staticmethod
+    def _deadline_risk(task: Task, incomplete_blockers: int, assignee_tasks: int, now: datetime) -> Dict[str, Any]:
+        """Deadline risk formula shared by the single-task and batch paths."""
         risk_score = 0.0
         risk_factors = []
         
         if not task.due_date:
             return {"risk_score": 0, "risk_level": "unknown", "factors": ["No deadline set"]}
         
-        days_until_due = (task.due_date - datetime.utcnow()).days
+        days_until_due = (task.due_date - now).days
         estimated = task.estimated_hours or 8
         actual = task.actual_hours or 0
         
@@ -82,27 +224,14 @@ class AITaskService:
             risk_factors.append("Limited progress with deadline approaching")
         
         # Blocking dependencies
-        if hasattr(task, 'predecessor_dependencies'):
-            blocking = [d for d in task.predecessor_dependencies if d.is_blocking]
-            incomplete_blockers = []
-            for dep in blocking:
-                pred = self.db.query(Task).filter(Task.id == dep.predecessor_id).first()
-                if pred and pred.status not in ["completed", "cancelled"]:
-                    incomplete_blockers.append(pred.name)
-            if incomplete_blockers:
-                risk_score += len(incomplete_blockers) * 15
-                risk_factors.append(f"Blocked by {len(incomplete_blockers)} incomplete tasks")
+        if incomplete_blockers:
+            risk_score += incomplete_blockers * 15
+            risk_factors.append(f"Blocked by {incomplete_blockers} incomplete tasks")
         
         # Assignee workload
-        if task.assignee_id:
-            assignee_tasks = self.db.query(Task).filter(
-                Task.assignee_id == task.assignee_id,
-                Task.status.in_(["todo", "in_progress"]),
-                Task.due_date <= task.due_date
-            ).count()
-            if assignee_tasks > 5:
-                risk_score += 20
-                risk_factors.append(f"Assignee has {assignee_tasks} tasks due before this")
+        if assignee_tasks > 5:
+            risk_score += 20
+            risk_factors.append(f"Assignee has {assignee_tasks} tasks due before this")
         
         # Determine risk level
         if risk_score >= 70:
@@ -0,0 +1,165 @@
+"""
+Dashboard cache - short-lived, per-user cache for dashboard responses.
+
+Dashboard endpoints aggregate over the user's tasks and time logs on every
+request, for numbers that only change when the user's tasks or hours change.
+Responses are kept in process for a few seconds and dropped as soon as a
+commit touches one of the rows they are built from. Other per-user caches
+reuse DashboardCache and register their own models with invalidate_on_commit.
+"""
+import threading
+import time
+from itertools import chain
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import Task, TimeEntry, TimeLog, Timesheet, User
+
+# Column holding the owning user of each model that feeds the dashboards
+DASHBOARD_USER_COLUMNS = {
+    Task: "assignee_id",
+    TimeLog: "user_id",
+    Timesheet: "user_id",
+    User: "id",
+}
+
+# Marker in the pending set when the affected user can't be resolved
+_ALL_USERS = object()
+
+
+class DashboardCache:
+    """Thread-safe TTL cache keyed by tuples whose second item is the user id."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 2048):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Cache value under key for ttl_seconds."""
+        if self.ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    # Still full of live entries; evict the oldest insertion
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + self.ttl_seconds, value)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached response belonging to a user."""
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if k[1] != user_id}
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _affected_users(
+    obj,
+    user_columns: Dict[type, str],
+    is_new: bool = False,
+    unowned_is_global: bool = False
+) -> Set[Any]:
+    """Users whose cached responses include obj, before and after this flush."""
+    if isinstance(obj, TimeEntry) and Timesheet in user_columns:
+        # Entries only reach a user through their timesheet
+        timesheet = inspect(obj).attrs.timesheet.loaded_value
+        if isinstance(timesheet, Timesheet):
+            return {timesheet.user_id}
+        return {_ALL_USERS}
+
+    column = user_columns.get(type(obj))
+    if column is None:
+        return set()
+    state = inspect(obj)
+    if column in state.unloaded:
+        return {_ALL_USERS}
+    history = state.attrs[column].history
+    if history.added and not history.deleted and not is_new:
+        # Reassigned without the previous owner ever being loaded
+        return {_ALL_USERS}
+    # History covers the previous value too: reassigning a task changes both
+    # the old and the new assignee's numbers
+    owners = set(history.sum()) or {state.attrs[column].value}
+    if unowned_is_global and None in owners:
+        return {_ALL_USERS}
+    return {user_id for user_id in owners if user_id}
+
+
+def invalidate_on_commit(
+    cache: DashboardCache,
+    user_columns: Dict[type, str],
+    global_models: Tuple[type, ...] = (),
+    unowned_is_global: bool = False
+) -> None:
+    """
+    Drop cache entries when a commit writes rows they were built from.
+
+    user_columns maps each model to the column holding its owning user, whose
+    entries are dropped; TimeEntry rows count for their timesheet's user when
+    Timesheet is listed. A write to any of global_models drops every entry,
+    as does a write to a row with no owner when unowned_is_global is set (for
+    caches that include unowned rows in every user's entry).
+    """
+    # session.info key for users whose entries go stale when the session commits
+    pending_key = f"user_cache_pending_{id(cache)}"
+    watched = (*user_columns, *global_models) + ((TimeEntry,) if Timesheet in user_columns else ())
+
+    def collect_flushed_users(session: Session, flush_context) -> None:
+        pending = session.info.setdefault(pending_key, set())
+        for obj in session.new:
+            pending |= {_ALL_USERS} if isinstance(obj, global_models) else _affected_users(
+                obj, user_columns, is_new=True, unowned_is_global=unowned_is_global
+            )
+        for obj in chain(session.dirty, session.deleted):
+            pending |= {_ALL_USERS} if isinstance(obj, global_models) else _affected_users(
+                obj, user_columns, unowned_is_global=unowned_is_global
+            )
+
+    def collect_statement_writes(orm_execute_state) -> None:
+        # Statement-level INSERT/UPDATE/DELETE (bulk writes, INSERT ... SELECT)
+        # don't go through the flush, and their rows aren't known here, so
+        # treat them as touching everyone
+        if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, watched):
+            orm_execute_state.session.info.setdefault(pending_key, set()).add(_ALL_USERS)
+
+    def invalidate_users(session: Session) -> None:
+        pending = session.info.pop(pending_key, None)
+        if not pending:
+            return
+        if _ALL_USERS in pending:
+            cache.clear()
+            return
+        for user_id in pending:
+            cache.invalidate_user(user_id)
+
+    event.listen(Session, "after_flush", collect_flushed_users)
+    event.listen(Session, "do_orm_execute", collect_statement_writes)
+    event.listen(Session, "after_commit", invalidate_users)
+
+
+dashboard_cache = DashboardCache(ttl_seconds=get_settings().dashboard_cache_ttl)
+invalidate_on_commit(dashboard_cache, DASHBOARD_USER_COLUMNS)
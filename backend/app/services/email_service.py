@@ -84,42 +84,52 @@ class EmailService:
 
 
 # Email templates
+@lru_cache(maxsize=32)
+def _base_frame(title: str) -> tuple:
+    """Render the shared email layout once per title, split around the content slot."""
+    content = "\0"
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <style>
+            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f4f4f5; margin: 0; padding: 20px; }}
+            .container {{ max-width: 600px; margin: 0 auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
+            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 24px; text-align: center; }}
+            .header h1 {{ margin: 0; font-size: 24px; }}
+            .content {{ padding: 24px; }}
+            .button {{ display: inline-block; background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px; margin: 16px 0; }}
+            .footer {{ background: #f4f4f5; padding: 16px; text-align: center; color: #666; font-size: 12px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>{title}</h1>
+            </div>
+            <div class="content">
+                {content}
+            </div>
+            <div class="footer">
+                <p>This email was sent by TimeSheet App</p>
+                <p>You can manage your notification preferences in your account settings.</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    head, _, tail = html.partition(content)
+    return head, tail
+
+
 class EmailTemplates:
     """HTML email templates for various notifications."""
     
     @staticmethod
     def base_template(content: str, title: str) -> str:
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f4f4f5; margin: 0; padding: 20px; }}
-                .container {{ max-width: 600px; margin: 0 auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 24px; text-align: center; }}
-                .header h1 {{ margin: 0; font-size: 24px; }}
-                .content {{ padding: 24px; }}
-                .button {{ display: inline-block; background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px; margin: 16px 0; }}
-                .footer {{ background: #f4f4f5; padding: 16px; text-align: center; color: #666; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>{title}</h1>
-                </div>
-                <div class="content">
-                    {content}
-                </div>
-                <div class="footer">
-                    <p>This email was sent by TimeSheet App</p>
-                    <p>You can manage your notification preferences in your account settings.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        head, tail = _base_frame(title)
+        return head + content + tail
     
     @staticmethod
     def task_assigned(task_name: str, assigned_by: str, due_date: str, task_url: str) -> str:
@@ -211,6 +221,17 @@ class EmailTemplates:
         <a href="/dashboard" class="button">View Dashboard</a>
         """
         return EmailTemplates.base_template(content, "Weekly Summary")
+    
+    @staticmethod
+    def user_invite(invited_by: str, invite_url: str) -> str:
+        content = f"""
+        <h2>You're Invited!</h2>
+        <p><strong>{invited_by}</strong> has invited you to join TimeSheet.</p>
+        <p>Click the link below to create your account:</p>
+        <a href="{invite_url}" style="display: inline-block; background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 8px;">Accept Invitation</a>
+        <p>This invitation expires in 7 days.</p>
+        """
+        return EmailTemplates.base_template(content, "You're Invited to TimeSheet")
 
 
 # Singleton instance
@@ -249,6 +270,16 @@ async def send_deadline_reminder_email(
     )
 
 
+async def send_invite_email(to_email: str, token: str, invited_by: str):
+    """Send user invitation email."""
+    html = EmailTemplates.user_invite(invited_by, f"/register?token={token}")
+    await email_service.send_email_async(
+        to_email=to_email,
+        subject="You're Invited to TimeSheet",
+        html_content=html
+    )
+
+
 async def send_daily_digest_email(
     to_email: str,
     user_name: str,
@@ -4,7 +4,21 @@ from typing import Optional, List, Dict, Any
 from decimal import Decimal
 from sqlalchemy import func, extract, case
 from sqlalchemy.orm import Session
-from app.models import Expense, ExpenseItem, ExpenseStatus, User, Department, Project, CostCenter
+from app.config import get_settings
+from app.models import Expense, ExpenseItem, User, Department, Project, CostCenter
+from app.services.dashboard_cache import DashboardCache, invalidate_on_commit
+
+# Analytics responses per (scope user, department, period); the same for every
+# admin looking at the same period, so most requests are served from here
+expense_analytics_cache = DashboardCache(ttl_seconds=get_settings().expense_analytics_cache_ttl)
+
+# Models whose rows feed the analytics sections (amounts, budgets and the
+# department/project names and memberships they are grouped by)
+ANALYTICS_MODELS = (Expense, ExpenseItem, CostCenter, Department, Project, User)
+
+# Totals are org-wide for admins, so any committed write to these models
+# drops every entry
+invalidate_on_commit(expense_analytics_cache, {}, global_models=ANALYTICS_MODELS)
 
 
 def get_expense_stats(
@@ -15,37 +29,34 @@ def get_expense_stats(
     end_date: Optional[date] = None
 ) -> Dict[str, Any]:
     """Get overall expense statistics."""
-    query = db.query(Expense)
+    # Only the columns the statistics need, as plain tuples
+    query = db.query(
+        Expense.total_amount, Expense.status, Expense.submitted_at, Expense.approved_at
+    )
     
     if user_id:
         query = query.filter(Expense.user_id == user_id)
     if department_id:
-        query = query.join(User).filter(User.department_id == department_id)
+        query = query.join(User, User.id == Expense.user_id).filter(User.department_id == department_id)
     if start_date:
         query = query.filter(Expense.created_at >= datetime.combine(start_date, datetime.min.time()))
     if end_date:
         query = query.filter(Expense.created_at <= datetime.combine(end_date, datetime.max.time()))
     
-    expenses = query.all()
-    
-    # Calculate statistics
-    total_amount = sum(float(e.total_amount or 0) for e in expenses)
-    total_count = len(expenses)
-    
+    # Calculate statistics in a single pass
+    total_amount = 0.0
+    total_count = 0
     status_counts = {}
-    for status in ExpenseStatus:
-        status_counts[status.value] = len([e for e in expenses if e.status == status.value])
+    approval_hours = []
+    for amount, status, submitted_at, approved_at in query:
+        total_amount += float(amount or 0)
+        total_count += 1
+        status_counts[status] = status_counts.get(status, 0) + 1
+        if approved_at and submitted_at:
+            approval_hours.append((approved_at - submitted_at).total_seconds() / 3600)
     
     # Calculate average approval time
-    approved_expenses = [e for e in expenses if e.approved_at and e.submitted_at]
-    if approved_expenses:
-        total_hours = sum(
-            (e.approved_at - e.submitted_at).total_seconds() / 3600 
-            for e in approved_expenses
-        )
-        avg_approval_time = total_hours / len(approved_expenses)
-    else:
-        avg_approval_time = None
+    avg_approval_time = sum(approval_hours) / len(approval_hours) if approval_hours else None
     
     return {
         "total_amount": total_amount,
@@ -221,8 +232,6 @@ def get_budget_comparison(
     period: str = "monthly"
 ) -> List[Dict[str, Any]]:
     """Get budget vs actual comparison for cost centers."""
-    cost_centers = db.query(CostCenter).filter(CostCenter.is_active == True).all()
-    
     # Get current period dates
     today = date.today()
     if period == "monthly":
@@ -235,32 +244,42 @@ def get_budget_comparison(
         quarter = (today.month - 1) // 3
         start = today.replace(month=quarter * 3 + 1, day=1)
         end_month = quarter * 3 + 3
-        if end_month > 12:
-            end = today.replace(year=today.year + 1, month=end_month - 12, day=1) - timedelta(days=1)
+        if end_month == 12:
+            end = today.replace(month=12, day=31)
         else:
             end = today.replace(month=end_month + 1, day=1) - timedelta(days=1)
     else:  # yearly
         start = today.replace(month=1, day=1)
         end = today.replace(month=12, day=31)
     
+    # Actual (approved or paid) spend per cost center in the period, joined
+    # onto the active cost centers so the whole comparison is one query
+    actuals = db.query(
+        Expense.cost_center_id,
+        func.sum(Expense.total_amount).label('actual')
+    ).filter(
+        Expense.cost_center_id.isnot(None),
+        Expense.status.in_(['approved', 'paid']),
+        Expense.created_at >= datetime.combine(start, datetime.min.time()),
+        Expense.created_at <= datetime.combine(end, datetime.max.time())
+    ).group_by(Expense.cost_center_id).subquery()
+    
+    rows = db.query(
+        CostCenter.id, CostCenter.name, CostCenter.budget_amount, actuals.c.actual
+    ).outerjoin(
+        actuals, actuals.c.cost_center_id == CostCenter.id
+    ).filter(CostCenter.is_active == True).all()
+    
     comparisons = []
-    for cc in cost_centers:
-        # Get actual expenses for this cost center in the period
-        actual = db.query(func.sum(Expense.total_amount)).filter(
-            Expense.cost_center_id == cc.id,
-            Expense.status.in_(['approved', 'paid']),
-            Expense.created_at >= datetime.combine(start, datetime.min.time()),
-            Expense.created_at <= datetime.combine(end, datetime.max.time())
-        ).scalar() or 0
-        
-        budget = float(cc.budget_amount or 0)
-        actual = float(actual)
+    for cc_id, cc_name, budget_amount, actual in rows:
+        budget = float(budget_amount or 0)
+        actual = float(actual or 0)
         variance = budget - actual
         variance_pct = (variance / budget * 100) if budget > 0 else 0
         
         comparisons.append({
-            "cost_center_id": cc.id,
-            "cost_center_name": cc.name,
+            "cost_center_id": cc_id,
+            "cost_center_name": cc_name,
             "budget_amount": budget,
             "actual_amount": actual,
             "variance": variance,
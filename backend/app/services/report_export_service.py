@@ -3,26 +3,11 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 from io import BytesIO
 import json
+from importlib.util import find_spec
 
-# Report generation
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+# reportlab and openpyxl are imported on first use, not with this module
+REPORTLAB_AVAILABLE = find_spec("reportlab") is not None
+OPENPYXL_AVAILABLE = find_spec("openpyxl") is not None
 
 import logging
 
@@ -48,6 +33,13 @@ class ReportExportService:
         if not self.reportlab_available:
             raise ImportError("reportlab is not installed. Install with: pip install reportlab")
         
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter, A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT
+        
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
         elements = []
@@ -133,6 +125,10 @@ class ReportExportService:
         if not self.openpyxl_available:
             raise ImportError("openpyxl is not installed. Install with: pip install openpyxl")
         
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+        from openpyxl.utils import get_column_letter
+        
         wb = Workbook()
         ws = wb.active
         ws.title = sheet_name
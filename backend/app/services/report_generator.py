@@ -3,26 +3,12 @@ import io
 from datetime import datetime, date
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
+from importlib.util import find_spec
 
-# Excel export using openpyxl
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-    from openpyxl.utils import get_column_letter
-    EXCEL_AVAILABLE = True
-except ImportError:
-    EXCEL_AVAILABLE = False
-
-# PDF export using reportlab
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+# openpyxl and reportlab are imported by the functions that use them, so that
+# importing this module (and the routers that do) stays cheap
+EXCEL_AVAILABLE = find_spec("openpyxl") is not None
+PDF_AVAILABLE = find_spec("reportlab") is not None
 
 
 def generate_expense_excel(
@@ -34,6 +20,10 @@ def generate_expense_excel(
     if not EXCEL_AVAILABLE:
         raise ImportError("openpyxl is required for Excel export. Install with: pip install openpyxl")
     
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+    from openpyxl.utils import get_column_letter
+    
     wb = Workbook()
     ws = wb.active
     ws.title = "Expense Report"
@@ -115,6 +105,12 @@ def generate_expense_pdf(
     if not PDF_AVAILABLE:
         raise ImportError("reportlab is required for PDF export. Install with: pip install reportlab")
     
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    
     output = io.BytesIO()
     doc = SimpleDocTemplate(output, pagesize=landscape(A4), topMargin=0.5*inch, bottomMargin=0.5*inch)
     
@@ -195,6 +191,10 @@ def generate_tax_report_excel(
     if not EXCEL_AVAILABLE:
         raise ImportError("openpyxl is required for Excel export")
     
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+    from openpyxl.utils import get_column_letter
+    
     wb = Workbook()
     ws = wb.active
     ws.title = f"Tax Report {year}"
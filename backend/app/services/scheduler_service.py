@@ -33,6 +33,7 @@ class JobType(str, Enum):
     ESCALATION_CHECK = "escalation_check"
     SLA_CHECK = "sla_check"
     CLEANUP = "cleanup"
+    PRIORITY_SCORES = "priority_scores"
 
 
 class SchedulerService:
@@ -131,6 +132,13 @@ class SchedulerService:
             minutes=15
         )
         
+        # Refresh persisted AI priority scores every hour
+        self.add_interval_job(
+            job_id="system_priority_scores",
+            func=self._run_priority_score_refresh,
+            hours=1
+        )
+        
         # Cleanup old data weekly
         self.add_cron_job(
             job_id="system_cleanup",
@@ -541,6 +549,25 @@ class SchedulerService:
         finally:
             db.close()
     
+    async def _run_priority_score_refresh(self):
+        """Recompute ai_priority_score for open tasks so /ai/prioritize can sort in SQL."""
+        logger.info("Running priority score refresh")
+        
+        if not self._db_session_factory:
+            return
+        
+        db = self._db_session_factory()
+        try:
+            from app.services.ai_task_service import AITaskService
+            
+            updated = AITaskService(db).recompute_priority_scores()
+            logger.info(f"Priority score refresh: updated {updated} tasks")
+        except Exception as e:
+            logger.error(f"Priority score refresh error: {e}")
+            db.rollback()
+        finally:
+            db.close()
+    
     async def _run_cleanup(self):
         """Clean up old data."""
         logger.info("Running cleanup job")
@@ -2,6 +2,7 @@
 from app.utils.security import (
     verify_password,
     get_password_hash,
+    get_password_hashes,
     create_access_token,
     decode_access_token,
     get_current_user,
@@ -37,6 +38,7 @@ __all__ = [
     # Security
     "verify_password",
     "get_password_hash",
+    "get_password_hashes",
     "create_access_token",
     "decode_access_token",
     "get_current_user",
@@ -0,0 +1,63 @@
+"""
+Keyset (seek) pagination for name-ordered list endpoints.
+
+Pages are ordered by ``(name, id)`` and the next page starts right after the
+last row returned, so a deep page is the same index range scan as the first
+one instead of walking every skipped row the way OFFSET does. The cursor for
+the next page is returned in the ``X-Next-Cursor`` header, keeping the list
+response bodies unchanged; ``skip`` still works for callers without one.
+"""
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from fastapi import Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.utils.error_handlers import ValidationError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(name: str, row_id: str) -> str:
+    """Opaque cursor pointing just after the row ``(name, row_id)``."""
+    raw = json.dumps([name, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of :func:`encode_cursor`; rejects anything it didn't produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name, row_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid cursor", field="cursor")
+    if not isinstance(name, str) or not isinstance(row_id, str):
+        raise ValidationError("Invalid cursor", field="cursor")
+    return name, row_id
+
+
+def paginate_by_name(
+    query: Query,
+    model,
+    response: Response,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None
+) -> List:
+    """
+    Fetch one ``(name, id)``-ordered page of ``query``.
+
+    Sets ``X-Next-Cursor`` when the page is full, i.e. more rows may follow.
+    """
+    query = query.order_by(model.name, model.id)
+    if cursor:
+        query = query.filter(tuple_(model.name, model.id) > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit).all()
+    if rows and len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].name, rows[-1].id)
+    return rows
@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+import os
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
@@ -33,6 +35,21 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+# bcrypt releases the GIL while hashing, so a thread pool spreads bulk
+# hashing across cores without pickling work out to worker processes
+_hash_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_password_hashes(passwords: List[str]) -> List[str]:
+    """Hash many passwords in parallel, preserving order."""
+    global _hash_executor
+    if len(passwords) < 2:
+        return [get_password_hash(password) for password in passwords]
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+    return list(_hash_executor.map(get_password_hash, passwords, chunksize=16))
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
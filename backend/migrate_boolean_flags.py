@@ -0,0 +1,46 @@
+"""
+Migration script: Convert saved_filters.is_shared and task_templates.is_global
+from "true"/"false" strings to real BOOLEAN columns.
+Run from the backend/ directory:  python migrate_boolean_flags.py
+"""
+from sqlalchemy import text
+from app.database import engine
+
+# (table, column, default)
+COLUMNS = [
+    ("saved_filters", "is_shared", "FALSE"),
+    ("task_templates", "is_global", "FALSE"),
+]
+
+
+def migrate():
+    print(f"Converting boolean flags on {engine.dialect.name}...")
+    with engine.begin() as conn:
+        for table, column, default in COLUMNS:
+            if engine.dialect.name == "postgresql":
+                data_type = conn.execute(text(
+                    "SELECT data_type FROM information_schema.columns "
+                    "WHERE table_name = :table AND column_name = :column"
+                ), {"table": table, "column": column}).scalar()
+                if data_type is None or data_type == "boolean":
+                    print(f"  . {table}.{column} already boolean or missing, skipping")
+                    continue
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT"))
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BOOLEAN "
+                    f"USING COALESCE(LOWER({column}::text) IN ('true', '1', 't'), FALSE)"
+                ))
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT {default}"))
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+            else:
+                # SQLite has no column types to alter; normalise the stored values to 0/1
+                conn.execute(text(
+                    f"UPDATE {table} SET {column} = "
+                    f"CASE WHEN LOWER(CAST({column} AS TEXT)) IN ('true', '1') THEN 1 ELSE 0 END"
+                ))
+            print(f"  + {table}.{column} converted")
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
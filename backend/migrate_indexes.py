@@ -0,0 +1,67 @@
+"""
+Migration script: Add composite indexes used by list and lookup queries.
+Run from the backend/ directory:  python migrate_indexes.py
+"""
+from sqlalchemy import text
+from app.database import engine
+
+# (index name, table, columns, unique, partial-index predicate)
+INDEXES = [
+    ("idx_saved_filters_user_entity", "saved_filters", "user_id, entity_type", False, None),
+    ("idx_saved_filters_share_token", "saved_filters", "share_token", True, "share_token IS NOT NULL"),
+    ("idx_task_templates_creator_global", "task_templates", "created_by_id, is_global", False, None),
+    ("idx_user_invites_email_status", "user_invites", "email, status", False, None),
+    ("idx_scheduled_reports_created_by", "scheduled_reports", "created_by_id", False, None),
+    ("idx_tasks_assignee_status_due", "tasks", "assignee_id, status, due_date", False, None),
+    ("idx_tasks_assignee_completed", "tasks", "assignee_id, completed_at", False, None),
+    ("idx_tasks_type_assignee", "tasks", "task_type, assignee_id", False, None),
+    ("idx_tasks_due_start", "tasks", "due_date, start_date", False, None),
+    ("idx_tasks_start_due", "tasks", "start_date, due_date", False, None),
+    ("idx_tasks_project_due", "tasks", "project_id, due_date", False, None),
+    ("idx_milestones_due", "milestones", "due_date", False, None),
+    ("idx_timesheets_user_status", "timesheets", "user_id, status", False, None),
+    ("idx_time_entries_timesheet_day", "time_entries", "timesheet_id, day", False, None),
+    ("idx_time_logs_user_date", "time_logs", "user_id, date", False, None),
+    ("idx_clients_name_id", "clients", "name, id", False, None),
+    ("idx_departments_name_id", "departments", "name, id", False, None),
+    ("idx_cost_centers_name_id", "cost_centers", "name, id", False, None),
+    ("idx_email_logs_user_created", "email_logs", "user_id, created_at, id", False, None),
+]
+
+# PostgreSQL-only trigram indexes so name ILIKE '%term%' searches (clients and
+# departments lists) can use an index instead of scanning the table
+TRIGRAM_INDEXES = [
+    ("idx_clients_name_trgm", "clients", "name"),
+    ("idx_departments_name_trgm", "departments", "name"),
+]
+
+# Indexes superseded by a wider one above (same leading columns)
+DROPPED_INDEXES = [
+    "idx_tasks_assignee_status",
+]
+
+
+def migrate():
+    print("Creating indexes...")
+    with engine.begin() as conn:
+        for name, table, columns, unique, where in INDEXES:
+            sql = f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+            if where:
+                sql += f" WHERE {where}"
+            conn.execute(text(sql))
+            print(f"  . {name}")
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for name, table, column in TRIGRAM_INDEXES:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)"
+                ))
+                print(f"  . {name}")
+        for name in DROPPED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            print(f"  - {name}")
+    print("Migration complete!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -108,3 +108,26 @@ def manager_headers(client: TestClient):
     })
     token = login_resp.json().get("access_token", "") if login_resp.status_code == 200 else ""
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(create_tables):
+    """Seed an approved admin directly in the DB and return its auth headers."""
+    from app.utils.security import create_access_token, get_password_hash
+
+    session = TestingSessionLocal()
+    admin = session.query(User).filter(User.email == "admin@lightidea.dev").first()
+    if not admin:
+        admin = User(
+            email="admin@lightidea.dev",
+            full_name="Admin User",
+            password_hash=get_password_hash("AdminPass123!"),
+            role="admin",
+            user_status="approved",
+            is_active=True,
+        )
+        session.add(admin)
+        session.commit()
+    token = create_access_token({"sub": admin.id})
+    session.close()
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,22 @@
+"""
+Tests for task templates in the advanced features router.
+"""
+from fastapi.testclient import TestClient
+
+
+def test_create_and_list_task_templates(client: TestClient, admin_headers: dict):
+    """Test a created template round-trips through create and list."""
+    response = client.post("/api/advanced/templates/tasks", json={
+        "name": "Release checklist",
+        "estimated_hours": 3,
+        "default_tags": ["release"],
+        "checklist_items": ["Tag build", "Publish notes"],
+    }, headers=admin_headers)
+    assert response.status_code == 200
+    created = response.json()
+    assert created["estimated_hours"] == 3
+    assert created["checklist_items"] == ["Tag build", "Publish notes"]
+
+    response = client.get("/api/advanced/templates/tasks", headers=admin_headers)
+    assert response.status_code == 200
+    assert created in response.json()
@@ -0,0 +1,56 @@
+"""
+Tests for AI task scoring (priority scores and deadline risks).
+"""
+from datetime import datetime, timedelta
+
+from app.models import Project, Task, TaskDependency
+from app.services.ai_task_service import AITaskService
+
+
+def _seed_tasks(db):
+    project = Project(name="Scoring Project", priority="high", status="active")
+    db.add(project)
+    db.flush()
+    tasks = [
+        Task(
+            name=f"Scoring task {i}",
+            status="todo",
+            priority=["low", "high", "urgent"][i % 3],
+            project_id=project.id if i % 2 else None,
+            due_date=datetime.utcnow() + timedelta(days=i - 2),
+            estimated_hours=4,
+        )
+        for i in range(6)
+    ]
+    db.add_all(tasks)
+    db.flush()
+    db.add(TaskDependency(predecessor_id=tasks[0].id, successor_id=tasks[1].id))
+    db.flush()
+    return tasks
+
+
+def test_batch_priority_scores_match_single(db):
+    """Test batch priority scoring matches per-task scoring."""
+    tasks = _seed_tasks(db)
+    service = AITaskService(db)
+    assert service.score_priorities_batch(tasks) == [service.calculate_priority_score(t) for t in tasks]
+
+
+def test_batch_deadline_risks_match_single(db):
+    """Test batch deadline risk prediction matches per-task prediction."""
+    tasks = _seed_tasks(db)
+    service = AITaskService(db)
+    risks = service.predict_deadline_risks_batch(tasks)
+    assert risks == [service.predict_deadline_risk(t) for t in tasks]
+    assert "Blocked by 1 incomplete tasks" in risks[1]["factors"]
+
+
+def test_recompute_priority_scores_persists(db):
+    """Test recomputed priority scores are stored on open tasks."""
+    tasks = _seed_tasks(db)
+    service = AITaskService(db)
+    expected = service.score_priorities_batch(tasks)
+    service.recompute_priority_scores(batch_size=4)
+    for task, score in zip(tasks, expected):
+        db.refresh(task)
+        assert task.ai_priority_score == score
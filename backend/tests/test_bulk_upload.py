@@ -0,0 +1,51 @@
+"""
+Tests for CSV bulk invite and bulk user creation.
+"""
+import uuid
+
+from fastapi.testclient import TestClient
+
+
+def _csv_file(text: str):
+    # Excel-style BOM to make sure the first header is still recognised
+    return {"file": ("users.csv", b"\xef\xbb\xbf" + text.encode("utf-8"), "text/csv")}
+
+
+def test_bulk_create_users(client: TestClient, admin_headers: dict):
+    """Test bulk user creation reports created and failed rows."""
+    suffix = uuid.uuid4().hex[:8]
+    csv_text = (
+        "email,full_name,password,skills\n"
+        f"bulk1-{suffix}@test.com,Bulk One,BulkPass123!,\"python,sql\"\n"
+        f"bulk2-{suffix}@test.com,Bulk Two,BulkPass123!,\n"
+        ",Missing Email,BulkPass123!,\n"
+        "admin@lightidea.dev,Existing User,BulkPass123!,\n"
+    )
+    response = client.post("/api/advanced/users/bulk-upload", files=_csv_file(csv_text), headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 4
+    assert data["created"] == 2
+    assert data["failed"] == 2
+
+
+def test_bulk_invite_users(client: TestClient, admin_headers: dict):
+    """Test bulk invites skip existing users and already-pending invites."""
+    suffix = uuid.uuid4().hex[:8]
+    csv_text = (
+        "email,role\n"
+        f"invite1-{suffix}@test.com,contributor\n"
+        f"invite2-{suffix}@test.com,manager\n"
+        "admin@lightidea.dev,contributor\n"
+        f"invite1-{suffix}@test.com,contributor\n"
+    )
+    response = client.post("/api/advanced/invites/bulk", files=_csv_file(csv_text), headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 4
+    assert data["created"] == 2
+    assert [e["error"] for e in data["errors"]] == ["User already exists", "Invitation already pending"]
+
+    # A single invite for an email with a pending invite is rejected
+    response = client.post("/api/advanced/invites", json={"email": f"invite2-{suffix}@test.com"}, headers=admin_headers)
+    assert response.status_code == 400
@@ -0,0 +1,28 @@
+"""
+Tests for the chatbot intent classifier.
+"""
+import pytest
+
+from app.routers.chatbot import intent_classifier_node
+
+
+def _classify(message: str) -> dict:
+    return intent_classifier_node({"user_message": message, "user_context": {"user_name": "Test User"}})
+
+
+@pytest.mark.parametrize("message, intent", [
+    ("e-mail to bob about the report", "email"),
+    ("send an email to the team", "email"),
+    ("please upload this receipt", "file_help"),
+    ("what can you tell me about uploads", "general"),
+    ("how many hours did I log", "general"),
+])
+def test_intent_classifier(message: str, intent: str):
+    """Test messages are routed to the expected intent."""
+    assert _classify(message)["intent"] == intent
+
+
+def test_intent_classifier_topic():
+    """Test the fallback topic follows CHAT_TOPICS priority."""
+    assert _classify("hey there")["topic"] == "greeting"
+    assert _classify("my expense and task list")["topic"] == "task"
@@ -0,0 +1,40 @@
+"""
+Tests for the cached personal dashboard.
+"""
+from fastapi.testclient import TestClient
+
+from app.models import TaskTemplate, User
+from tests.conftest import TestingSessionLocal
+
+
+def _seed_template(name: str) -> tuple:
+    """Create a task template owned by the seeded admin; returns (template id, admin id)."""
+    session = TestingSessionLocal()
+    admin = session.query(User).filter(User.email == "admin@lightidea.dev").first()
+    template = TaskTemplate(name=name, task_name_template=name, created_by_id=admin.id)
+    session.add(template)
+    session.commit()
+    ids = (template.id, admin.id)
+    session.close()
+    return ids
+
+
+def test_personal_dashboard_sees_insert_select_tasks(client: TestClient, admin_headers: dict):
+    """A task created by INSERT ... SELECT invalidates the cached dashboard and its ETag."""
+    template_id, admin_id = _seed_template("Dashboard cache template")
+
+    before = client.get("/api/dashboard/personal", headers=admin_headers)
+    assert before.status_code == 200
+    etag = before.headers["etag"]
+
+    created = client.post(
+        f"/api/advanced/tasks/from-template/{template_id}",
+        params={"assignee_id": admin_id},
+        headers=admin_headers,
+    )
+    assert created.status_code == 200
+
+    after = client.get("/api/dashboard/personal", headers={**admin_headers, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+    assert after.json()["my_tasks_count"] == before.json()["my_tasks_count"] + 1
@@ -0,0 +1,37 @@
+"""
+Tests for the OpenAPI documents served by the API.
+"""
+from fastapi.testclient import TestClient
+
+
+def test_openapi_lite_is_trimmed(client: TestClient):
+    """Test the runtime schema drops docs-only content and unused schemas."""
+    full = client.get("/api/openapi.json").json()
+    response = client.get("/api/openapi-lite.json")
+    assert response.status_code == 200
+    lite = response.json()
+
+    assert "paths" in lite and lite["paths"].keys() == full["paths"].keys()
+    for key in ("webhooks", "servers", "externalDocs", "tags"):
+        assert key not in lite
+    assert "examples" not in lite.get("components", {})
+    assert "\n" not in lite["info"].get("description", "")
+    # PaginatedResponse is documentation-only and never referenced by a path
+    assert "PaginatedResponse" not in lite["components"].get("schemas", {})
+    assert len(response.content) < len(client.get("/api/openapi.json").content)
+
+
+def test_openapi_conditional_get(client: TestClient):
+    """Test /api/openapi.json returns an ETag and 304 on revalidation."""
+    response = client.get("/api/openapi.json")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "no-store" not in response.headers["cache-control"]
+
+    cached = client.get("/api/openapi.json", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    stale = client.get("/api/openapi.json", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
@@ -141,12 +141,12 @@ export async function sendTestEmail(): Promise<{ success: boolean; message: stri
  * Get email logs for current user
  */
 export async function getEmailLogs(
-    page: number = 1,
-    limit: number = 20
-): Promise<{ logs: EmailLog[]; total: number; pages: number }> {
-    return apiGet<{ logs: EmailLog[]; total: number; pages: number }>(
+    limit: number = 20,
+    cursor?: string
+): Promise<{ logs: EmailLog[]; next_cursor: string | null }> {
+    return apiGet<{ logs: EmailLog[]; next_cursor: string | null }>(
         "/api/notifications/email/logs",
-        { page, limit }
+        { limit, cursor }
     );
 }
 